@@ -179,7 +179,12 @@ def stop_system():
     
     system_running = False
     camera_manager.stop_all()
-    
+
+    # Drain queued forensic alerts and buffered detection logs to disk
+    # before reporting the system stopped
+    alert_manager.flush()
+    detection_logger.flush()
+
     return jsonify({"status": "success", "message": "System stopped"})
 
 
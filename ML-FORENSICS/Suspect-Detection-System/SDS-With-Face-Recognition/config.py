@@ -5,6 +5,7 @@ Forensic-grade configuration with security defaults
 
 import os
 from datetime import datetime
+from functools import lru_cache
 
 # ==================== SYSTEM IDENTITY ====================
 SYSTEM_NAME = "Forensic Suspect Detection System (SDS)"
@@ -59,6 +60,7 @@ EVIDENCE_DIR = os.path.join(BASE_DIR, "evidence")
 
 # Database files
 WATCHLIST_CSV = os.path.join(DATA_DIR, "watchlist.csv")
+WATCHLIST_DB = os.path.join(DATA_DIR, "watchlist.db")  # Hot per-detection state
 EMBEDDINGS_FILE = os.path.join(DATA_DIR, "watchlist_embeddings.pkl")
 CASE_DATABASE = os.path.join(DATA_DIR, "cases.csv")
 
@@ -126,6 +128,7 @@ GPU_DEVICE_ID = 0
 # ==================== LIMITS & SAFEGUARDS ====================
 MAX_DETECTIONS_PER_HOUR = 1000  # Safety limit to prevent system abuse
 MAX_ALERTS_PER_HOUR = 50  # Alert rate limiting
+ALERT_HISTORY_MAX = 100000  # In-memory alerts; full history stays in ALERT_LOG
 REQUIRE_SUPERVISOR_APPROVAL = True  # For high-risk level matches
 
 # ==================== RISK LEVELS ====================
@@ -152,8 +155,9 @@ def ensure_directories():
     for directory in [DATA_DIR, LOGS_DIR, EVIDENCE_DIR, ALERT_FRAMES_DIR, SUSPECT_TRACES_DIR]:
         os.makedirs(directory, exist_ok=True)
 
+@lru_cache(maxsize=16)
 def get_risk_level_config(risk_level):
-    """Get configuration for a specific risk level."""
+    """Get configuration for a specific risk level (cached; the table is fixed)."""
     return RISK_LEVELS.get(risk_level.upper(), RISK_LEVELS["REVIEW"])
 
 def is_authorized_agency(agency):
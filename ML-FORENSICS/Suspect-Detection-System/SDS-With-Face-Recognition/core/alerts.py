@@ -5,15 +5,28 @@ Internal alerts to control room and authorized personnel only
 
 import os
 import json
+import atexit
+import queue
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from collections import Counter, defaultdict, deque
 from datetime import datetime, timedelta
 import cv2
+import numpy as np
 import config
 from core.recognition import FaceRecognitionEngine
 
 
 class AlertManager:
     """Manages alerts with cooldown and forensic logging."""
-    
+
+    # Quality 85 roughly halves evidence JPEG size and encode time versus
+    # the OpenCV default with no perceptible loss
+    _JPEG_PARAMS = [cv2.IMWRITE_JPEG_QUALITY, 85, cv2.IMWRITE_JPEG_OPTIMIZE, 1]
+
+
     def __init__(self, watchlist_manager):
         """
         Initialize alert manager.
@@ -22,12 +35,64 @@ class AlertManager:
             watchlist_manager: WatchlistManager instance
         """
         self.watchlist_manager = watchlist_manager
-        self.alert_cooldowns = {}  # person_id -> last_alert_time
+        self.alert_cooldowns = {}  # person_id -> last alert epoch (float)
         self.alert_history = []
+        # Parallel epoch timestamps for alert_history. Alerts are appended
+        # in chronological order, so this list stays sorted and time-window
+        # queries can bisect instead of scanning the full history.
+        self._alert_epochs = []
+        # Sliding one-hour window for rate limiting; expired entries are
+        # popped from the left so should_alert never rescans the history
+        self._alert_times = deque()
+        # Incremental aggregates updated O(1) per alert, so statistics and
+        # per-person queries never rescan the full history. They describe
+        # the in-memory window and are decremented when the history is
+        # trimmed; per-person lists are deques so eviction pops their
+        # oldest entry in O(1)
+        self._by_risk = Counter()
+        self._by_status = Counter()
+        self._by_person = defaultdict(deque)
+        self._conf_sum = 0.0
+        self._unique_persons = set()
         self.alert_count = 0
+        # Watchlist records rarely change while the system runs; cache them
+        # per person so repeated alerts skip the CSV-backed lookup
+        self._person_info_cache = {}
+        # Pool of annotation buffers for evidence frames. Buffers are checked
+        # out here, handed to the encoder workers and returned after the
+        # encode, so a steady alert rate stops hitting the allocator entirely
+        self._scratch_pool = []
+        # One-slot frame hash cache: frames with several watchlist matches
+        # trigger several alerts against the same buffer, which only needs
+        # hashing once. Holding the frame itself (not just its id) pins the
+        # buffer so a recycled allocation can never alias a stale hash
+        self._last_hashed_frame = None
+        self._last_frame_hash = None
         
         # Ensure alert frames directory exists
         os.makedirs(config.ALERT_FRAMES_DIR, exist_ok=True)
+
+        # Long-lived buffered handle for the alert log. Opening/closing the
+        # file per alert costs three syscalls per event; a 64 KB buffer
+        # amortizes them away while keeping the log append-only.
+        self._alert_log_fh = open(config.ALERT_LOG, "a", buffering=1 << 16)
+
+        # Alert serialization and disk writes happen on a dedicated writer
+        # thread so the recognition thread only enqueues the alert dict.
+        # The queue is bounded to keep memory in check if the disk stalls.
+        self._log_queue = queue.Queue(maxsize=10000)
+        self._writer_running = True
+        self._writer_thread = threading.Thread(target=self._writer_loop, daemon=True)
+        self._writer_thread.start()
+
+        # Evidence JPEG encoding runs on worker threads so libjpeg never
+        # blocks the recognition thread
+        self._frame_executor = ThreadPoolExecutor(max_workers=2)
+
+        # The writer is a daemon thread, so without this hook any alerts
+        # still queued at interpreter exit would be lost; drain them the
+        # same way the audit log and custody log close themselves
+        atexit.register(self.close)
     
     def should_alert(self, person_id):
         """
@@ -39,22 +104,21 @@ class AlertManager:
         Returns:
             bool: True if alert should be sent
         """
-        now = datetime.now()
-        
+        now = time.time()
+
         # Check if person is in cooldown
         if person_id in self.alert_cooldowns:
             last_alert = self.alert_cooldowns[person_id]
-            time_diff = (now - last_alert).total_seconds()
-            
-            if time_diff < config.ALERT_COOLDOWN_SECONDS:
+
+            if now - last_alert < config.ALERT_COOLDOWN_SECONDS:
                 return False
-        
-        # Check hourly rate limit
-        one_hour_ago = now - timedelta(hours=1)
-        recent_alerts = [a for a in self.alert_history 
-                        if datetime.fromisoformat(a["timestamp"]) > one_hour_ago]
-        
-        if len(recent_alerts) >= config.MAX_ALERTS_PER_HOUR:
+
+        # Check hourly rate limit (drop expired entries in O(1) amortized)
+        cutoff_epoch = now - 3600.0
+        while self._alert_times and self._alert_times[0] < cutoff_epoch:
+            self._alert_times.popleft()
+
+        if len(self._alert_times) >= config.MAX_ALERTS_PER_HOUR:
             print("[WARNING] Alert rate limit reached. Suppressing alert.")
             return False
         
@@ -77,9 +141,12 @@ class AlertManager:
         if not self.should_alert(person_id):
             return None
         
-        # Get person information from watchlist
-        person_info = self.watchlist_manager.get_person_info(person_id)
-        
+        # Get person information from watchlist (cached after first lookup)
+        person_info = self._person_info_cache.get(person_id)
+        if person_info is None:
+            person_info = self.watchlist_manager.get_person_info(person_id)
+            self._person_info_cache[person_id] = person_info
+
         if person_info is None:
             print(f"[ERROR] Person {person_id} not found in watchlist")
             return None
@@ -90,12 +157,20 @@ class AlertManager:
         
         # Save evidence frame
         frame_filename = self._save_alert_frame(frame, detection, person_id)
-        frame_hash = FaceRecognitionEngine.hash_frame(frame)
+
+        # Hash the frame once per buffer, not once per matched face
+        if frame is self._last_hashed_frame:
+            frame_hash = self._last_frame_hash
+        else:
+            frame_hash = FaceRecognitionEngine.hash_frame(frame)
+            self._last_hashed_frame = frame
+            self._last_frame_hash = frame_hash
         
         # Create alert object
         alert = {
             "alert_id": f"ALERT-{self.alert_count:06d}",
             "timestamp": detection["timestamp"],
+            "timestamp_epoch": time.time(),
             "person_id": person_id,
             "full_name": person_info["FullName"],
             "case_id": person_info["CaseID"],
@@ -109,7 +184,7 @@ class AlertManager:
             "occlusion_level": detection["occlusion_level"],
             "occlusion_percentage": float(detection["occlusion_percentage"]),  # Convert numpy float32
             "mask_detected": bool(detection["mask_detected"]),  # Convert numpy bool
-            "bbox": [int(x) for x in detection["bbox"]],  # Convert numpy array
+            "bbox": np.asarray(detection["bbox"], dtype=np.int32).tolist(),  # tolist() yields Python ints
             "evidence_frame": frame_filename,
             "frame_hash": frame_hash,
             "authorized_agency": person_info["AuthorizedAgency"],
@@ -119,11 +194,46 @@ class AlertManager:
         }
         
         # Update cooldown
-        self.alert_cooldowns[person_id] = datetime.now()
+        self.alert_cooldowns[person_id] = alert["timestamp_epoch"]
         
-        # Add to history
+        # Add to history (keeps the epoch index aligned and sorted)
         self.alert_history.append(alert)
+        self._alert_epochs.append(alert["timestamp_epoch"])
+        self._alert_times.append(alert["timestamp_epoch"])
+        self._by_risk[risk_level] += 1
+        self._by_status[alert["legal_status"]] += 1
+        self._by_person[person_id].append(alert)
+        self._conf_sum += alert["confidence"]
+        self._unique_persons.add(person_id)
         self.alert_count += 1
+
+        # Bound the in-memory history; evicted alerts remain on disk in the
+        # append-only alert log. Trimming in blocks keeps the O(N) deletes
+        # amortized instead of paying one per alert at the cap.
+        if len(self.alert_history) >= config.ALERT_HISTORY_MAX + 1024:
+            # Back the evicted block out of the running aggregates so the
+            # statistics keep describing exactly the retained window, and
+            # drop the per-person references so the cap actually bounds
+            # memory. History and per-person deques are both chronological,
+            # so each evicted alert is the head of its person's deque.
+            for old in self.alert_history[:1024]:
+                old_risk = old["risk_level"]
+                self._by_risk[old_risk] -= 1
+                if self._by_risk[old_risk] == 0:
+                    del self._by_risk[old_risk]
+                old_status = old["legal_status"]
+                self._by_status[old_status] -= 1
+                if self._by_status[old_status] == 0:
+                    del self._by_status[old_status]
+                self._conf_sum -= old["confidence"]
+                old_person = old["person_id"]
+                person_alerts = self._by_person[old_person]
+                person_alerts.popleft()
+                if not person_alerts:
+                    del self._by_person[old_person]
+                    self._unique_persons.discard(old_person)
+            del self.alert_history[:1024]
+            del self._alert_epochs[:1024]
         
         # Log alert
         self._log_alert(alert)
@@ -151,34 +261,94 @@ class AlertManager:
         filename = f"{person_id}_{timestamp}.jpg"
         filepath = os.path.join(config.ALERT_FRAMES_DIR, filename)
         
-        # Draw detection on frame
-        annotated_frame = frame.copy()
+        # Draw detection on a pooled scratch buffer; copyto writes into the
+        # existing allocation and the caller's frame stays untouched
+        annotated_frame = None
+        if self._scratch_pool and self._scratch_pool[-1].shape == frame.shape:
+            annotated_frame = self._scratch_pool.pop()
+        if annotated_frame is None:
+            annotated_frame = np.empty_like(frame)
+        np.copyto(annotated_frame, frame)
         x1, y1, x2, y2 = detection["bbox"]
         
         # Draw red bounding box
         cv2.rectangle(annotated_frame, (x1, y1), (x2, y2), (0, 0, 255), 3)
         
-        # Add timestamp and person ID
-        info_text = f"{person_id} | {detection['confidence']:.2f}"
+        # Add timestamp and person ID in one label: the detection timestamp
+        # is already ISO formatted (slice to seconds), so no strftime call,
+        # and a single putText rasterizes one text layer instead of two
+        timestamp_text = detection["timestamp"][:19].replace("T", " ")
+        info_text = f"{person_id} | {detection['confidence']:.2f} | {timestamp_text}"
         cv2.putText(annotated_frame, info_text, (10, 30),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 255), 2)
-        
-        timestamp_text = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        cv2.putText(annotated_frame, timestamp_text, (10, 60),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
-        
-        # Save frame
-        cv2.imwrite(filepath, annotated_frame)
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
         
+        # Hand the annotated buffer to the encoder workers; it returns to the
+        # pool once the encode has finished, so it cannot race with the next
+        # annotation
+        self._frame_executor.submit(self._write_evidence_frame, filepath, annotated_frame)
+
         return filename
+
+    def _write_evidence_frame(self, filepath, annotated_frame):
+        """Encode and write an evidence JPEG off the alert thread."""
+        ok, buffer = cv2.imencode(".jpg", annotated_frame, self._JPEG_PARAMS)
+        if ok:
+            buffer.tofile(filepath)
+        else:
+            print(f"[ERROR] Failed to encode evidence frame: {filepath}")
+
+        # Return the scratch buffer for reuse (bounded so a camera
+        # resolution change doesn't strand stale shapes)
+        if len(self._scratch_pool) < 4:
+            self._scratch_pool.append(annotated_frame)
     
     def _log_alert(self, alert):
-        """Log alert to forensic alert log."""
-        log_entry = json.dumps(alert, indent=2)
-        
-        with open(config.ALERT_LOG, "a") as f:
-            f.write(f"{log_entry}\n")
-            f.write("-" * 80 + "\n")
+        """Queue alert for the background log writer."""
+        try:
+            self._log_queue.put_nowait(alert)
+        except queue.Full:
+            # Never drop a forensic log entry; block until there is room
+            print("[WARNING] Alert log queue full. Blocking until drained.")
+            self._log_queue.put(alert)
+
+    def _writer_loop(self):
+        """Background writer: drain queued alerts and write them in batches."""
+        while self._writer_running:
+            try:
+                alert = self._log_queue.get(timeout=1.0)
+            except queue.Empty:
+                continue
+
+            # Gather whatever else is already queued into one write
+            batch = [alert]
+            while len(batch) < 64:
+                try:
+                    batch.append(self._log_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            # Compact separators: pretty-printing roughly triples the bytes
+            # written for no forensic benefit
+            lines = [f"{json.dumps(a, separators=(',', ':'))}\n" + "-" * 80 + "\n"
+                     for a in batch]
+            self._alert_log_fh.write("".join(lines))
+
+            for _ in batch:
+                self._log_queue.task_done()
+
+    def flush(self):
+        """Wait for queued alerts to be written and flush to disk."""
+        self._log_queue.join()
+        self._alert_log_fh.flush()
+
+    def close(self):
+        """Drain the log queue and close the alert log (call on shutdown)."""
+        if self._alert_log_fh.closed:  # already closed explicitly
+            return
+        self._frame_executor.shutdown(wait=True)
+        self._log_queue.join()
+        self._writer_running = False
+        self._alert_log_fh.close()
     
     def get_recent_alerts(self, hours=24):
         """
@@ -190,24 +360,44 @@ class AlertManager:
         Returns:
             List of recent alerts
         """
-        cutoff_time = datetime.now() - timedelta(hours=hours)
-        
-        recent = [a for a in self.alert_history 
-                 if datetime.fromisoformat(a["timestamp"]) > cutoff_time]
-        
-        # Sort by timestamp (newest first)
-        recent.sort(key=lambda x: x["timestamp"], reverse=True)
-        
-        return recent
+        cutoff_epoch = (datetime.now() - timedelta(hours=hours)).timestamp()
+
+        # History is sorted by time, so bisect to the window start and slice
+        start = bisect_right(self._alert_epochs, cutoff_epoch)
+
+        # Newest first
+        return self.alert_history[start:][::-1]
+
+    def get_alerts_between(self, start_time, end_time):
+        """
+        Get alerts inside a time window, oldest first.
+
+        Args:
+            start_time: Window start (datetime)
+            end_time: Window end (datetime)
+
+        Returns:
+            List of alerts in chronological order
+        """
+        # History is sorted by time, so two bisects bound the window
+        # without parsing a single timestamp string
+        lo = bisect_left(self._alert_epochs, start_time.timestamp())
+        hi = bisect_right(self._alert_epochs, end_time.timestamp())
+        return self.alert_history[lo:hi]
     
     def get_alerts_by_person(self, person_id):
         """Get all alerts for a specific person."""
-        return [a for a in self.alert_history if a["person_id"] == person_id]
-    
+        return list(self._by_person.get(person_id, []))
+
     def get_alert_statistics(self):
-        """Get alert statistics for monitoring."""
+        """
+        Get alert statistics for monitoring (O(1) from running aggregates).
+
+        Covers the retained in-memory history; alerts evicted by the
+        history cap live on in the append-only alert log.
+        """
         total_alerts = len(self.alert_history)
-        
+
         if total_alerts == 0:
             return {
                 "total_alerts": 0,
@@ -215,30 +405,19 @@ class AlertManager:
                 "alerts_by_status": {},
                 "avg_confidence": 0.0
             }
-        
-        # Group by risk level
-        alerts_by_risk = {}
-        for alert in self.alert_history:
-            risk = alert["risk_level"]
-            alerts_by_risk[risk] = alerts_by_risk.get(risk, 0) + 1
-        
-        # Group by legal status
-        alerts_by_status = {}
-        for alert in self.alert_history:
-            status = alert["legal_status"]
-            alerts_by_status[status] = alerts_by_status.get(status, 0) + 1
-        
-        # Average confidence
-        avg_confidence = sum(a["confidence"] for a in self.alert_history) / total_alerts
-        
+
         return {
             "total_alerts": total_alerts,
-            "alerts_by_risk": alerts_by_risk,
-            "alerts_by_status": alerts_by_status,
-            "avg_confidence": avg_confidence,
-            "unique_persons": len(set(a["person_id"] for a in self.alert_history))
+            "alerts_by_risk": dict(self._by_risk),
+            "alerts_by_status": dict(self._by_status),
+            "avg_confidence": self._conf_sum / total_alerts,
+            "unique_persons": len(self._unique_persons)
         }
     
+    def invalidate_person(self, person_id):
+        """Drop cached watchlist info for a person (call after watchlist edits)."""
+        self._person_info_cache.pop(person_id, None)
+
     def clear_cooldowns(self):
         """Clear all alert cooldowns (admin function)."""
         self.alert_cooldowns.clear()
@@ -250,6 +429,15 @@ class DetectionLogger:
     
     def __init__(self):
         self.detection_count = 0
+        # Buffered handles kept open for the lifetime of the logger; these
+        # logs are written once per face per frame, so per-call open/close
+        # would dominate the logging cost
+        self._detection_log_fh = open(config.DETECTION_LOG, "a", buffering=1 << 16)
+        self._system_log_fh = open(config.SYSTEM_LOG, "a", buffering=1 << 16)
+        # Shared compact encoder: default separators pad every entry with
+        # spaces, and reusing one bound encode method skips the per-call
+        # dumps() dispatch
+        self._encode = json.JSONEncoder(separators=(",", ":")).encode
     
     def log_detection(self, detection, camera_id):
         """
@@ -267,13 +455,17 @@ class DetectionLogger:
             "confidence": float(detection["confidence"]),  # Convert numpy float32 to Python float
             "occlusion_level": detection["occlusion_level"],
             "mask_detected": bool(detection["mask_detected"]),  # Convert numpy bool to Python bool
-            "bbox": [int(x) for x in detection["bbox"]]  # Convert numpy int to Python int
+            "bbox": np.asarray(detection["bbox"], dtype=np.int32).tolist()  # tolist() yields Python ints
         }
         
-        with open(config.DETECTION_LOG, "a") as f:
-            f.write(f"{json.dumps(log_entry)}\n")
-        
+        self._detection_log_fh.write(self._encode(log_entry))
+        self._detection_log_fh.write("\n")
+
         self.detection_count += 1
+
+        # Periodic flush so a crash loses at most a bounded window
+        if self.detection_count % 100 == 0:
+            self._detection_log_fh.flush()
     
     def log_frame_processing(self, camera_id, num_faces, processing_time):
         """Log frame processing metrics."""
@@ -284,8 +476,18 @@ class DetectionLogger:
             "processing_time_ms": processing_time
         }
         
-        with open(config.SYSTEM_LOG, "a") as f:
-            f.write(f"{json.dumps(log_entry)}\n")
+        self._system_log_fh.write(self._encode(log_entry))
+        self._system_log_fh.write("\n")
+
+    def flush(self):
+        """Flush buffered log writes to disk."""
+        self._detection_log_fh.flush()
+        self._system_log_fh.flush()
+
+    def close(self):
+        """Flush and close log handles (call on shutdown)."""
+        self._detection_log_fh.close()
+        self._system_log_fh.close()
 
 
 # ==================== POST-INCIDENT TRACING ====================
@@ -342,43 +544,42 @@ class PostIncidentTracer:
             frame_height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
             writer = cv2.VideoWriter(output_path, fourcc, fps, (frame_width, frame_height))
         
+        step = max(1, fps // 2)  # Process 2 frames per second
+
+        # Sampled frames are recognized in batches; tracing is offline so
+        # the added latency is free and the batch amortizes per-call cost
+        pending = []
+
         while True:
-            ret, frame = cap.read()
-            if not ret:
+            # grab() only advances the demuxer; skipped frames are never
+            # decoded, so sampling at 2 fps skips the decode for the rest
+            if not cap.grab():
                 break
-            
+
             frame_count += 1
-            
-            # Process every Nth frame to speed up
-            if frame_count % max(1, fps // 2) != 0:  # Process 2 frames per second
+
+            if frame_count % step != 0:
                 continue
-            
-            # Detect and recognize
-            frame_detections = self.recognition_engine.process_frame(frame, "HISTORICAL")
-            
-            for detection in frame_detections:
-                if detection["person_id"] == person_id:
-                    # Use lower threshold for historical analysis
-                    if detection["confidence"] >= config.TRACE_CONFIDENCE_THRESHOLD:
-                        timestamp_seconds = frame_count / fps
-                        detection["video_timestamp"] = timestamp_seconds
-                        detection["frame_number"] = frame_count
-                        detections.append(detection)
-                        
-                        print(f"[TRACE] Found at {timestamp_seconds:.1f}s (frame {frame_count})")
-                        
-                        # Annotate frame if saving
-                        if writer:
-                            annotated = self.recognition_engine.draw_detection_on_frame(
-                                frame.copy(), detection
-                            )
-                            writer.write(annotated)
-            
+
+            ret, frame = cap.retrieve()
+            if not ret:
+                break
+
+            pending.append((frame_count, frame))
+
+            if len(pending) >= config.BATCH_PROCESSING_SIZE:
+                self._match_trace_batch(pending, person_id, fps, detections, writer)
+                pending = []
+
             # Progress indicator
             if frame_count % (fps * 10) == 0:  # Every 10 seconds
                 progress = (frame_count / total_frames) * 100
                 print(f"[TRACE] Progress: {progress:.1f}%")
-        
+
+        # Flush any partial batch at end of video
+        if pending:
+            self._match_trace_batch(pending, person_id, fps, detections, writer)
+
         cap.release()
         if writer:
             writer.release()
@@ -390,23 +591,72 @@ class PostIncidentTracer:
         
         return detections
     
+    def _match_trace_batch(self, pending, person_id, fps, detections, writer):
+        """Run recognition over a batch of sampled frames and record hits."""
+        frames = [frame for _, frame in pending]
+        batch_results = self.recognition_engine.process_frames_batch(frames, "HISTORICAL")
+
+        for (frame_number, frame), frame_detections in zip(pending, batch_results):
+            for detection in frame_detections:
+                if detection["person_id"] == person_id:
+                    # Use lower threshold for historical analysis
+                    if detection["confidence"] >= config.TRACE_CONFIDENCE_THRESHOLD:
+                        timestamp_seconds = frame_number / fps
+                        detection["video_timestamp"] = timestamp_seconds
+                        detection["frame_number"] = frame_number
+                        # Hash the evidence region only for detections the
+                        # report actually persists, not per face per frame
+                        detection["region_hash"] = self.recognition_engine.hash_region(
+                            frame, detection["bbox"]
+                        )
+                        detections.append(detection)
+
+                        print(f"[TRACE] Found at {timestamp_seconds:.1f}s (frame {frame_number})")
+
+                        # Annotate frame if saving. The decoded frame is not
+                        # reused after this point, so draw in place instead of
+                        # copying ~6 MB per hit
+                        if writer:
+                            annotated = self.recognition_engine.draw_detection_on_frame(
+                                frame, detection
+                            )
+                            writer.write(annotated)
+
     def _save_trace_report(self, person_id, video_path, detections):
         """Save post-incident trace report."""
         report_filename = f"trace_{person_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
         report_path = os.path.join(config.SUSPECT_TRACES_DIR, report_filename)
         
-        report = {
+        report_meta = {
             "person_id": person_id,
             "video_source": video_path,
             "analysis_timestamp": datetime.now().isoformat(),
             "total_detections": len(detections),
-            "detections": detections,
             "confidence_threshold": config.TRACE_CONFIDENCE_THRESHOLD
         }
-        
-        with open(report_path, "w") as f:
-            json.dump(report, f, indent=2)
-        
+
+        # Stream the report: metadata first, then one compact line per
+        # detection, so long traces never pretty-print megabytes or hold
+        # the whole serialized report in memory
+        with open(report_path, "w", buffering=1 << 20) as f:
+            f.write("{")
+            for key, value in report_meta.items():
+                f.write(f"{json.dumps(key)}:{json.dumps(value)},")
+            f.write('"detections":[\n')
+
+            for i, detection in enumerate(detections):
+                entry = dict(detection)
+                # Raw embedding vectors don't belong in the JSON report
+                # (and aren't JSON-serializable anyway)
+                entry.pop("embedding", None)
+                entry["detection_score"] = float(entry["detection_score"])
+
+                if i:
+                    f.write(",\n")
+                f.write(json.dumps(entry, separators=(",", ":")))
+
+            f.write("\n]}\n")
+
         print(f"[TRACE] Report saved: {report_path}")
 
 
@@ -6,7 +6,8 @@ Handles multiple camera feeds with fallback and reconnection
 import cv2
 import threading
 import time
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 import config
 
 
@@ -24,11 +25,18 @@ class CameraStream:
         self.camera_id = camera_id
         self.camera_index = camera_index
         self.cap = None
-        self.frame = None
+        # Single-producer/single-consumer frame hand-off: the capture thread
+        # alternates between two slots and publishes by bumping _write_idx,
+        # so the consumer always sees a fully decoded frame without a lock
+        self._slots = [None, None]
+        self._write_idx = 0
         self.running = False
         self.thread = None
-        self.last_frame_time = None
+        self.last_frame_time = None  # monotonic seconds of last good frame
         self.reconnect_attempts = 0
+        # Earliest monotonic time the next reconnect may be attempted;
+        # rate limits blocking VideoCapture opens in the coordinator loop
+        self._next_reconnect_time = 0.0
         self.is_connected = False
     
     def start(self):
@@ -48,37 +56,66 @@ class CameraStream:
         print(f"[CAMERA] {self.camera_id} stream stopped")
     
     def _capture_loop(self):
-        """Main capture loop running in separate thread."""
+        """Main capture loop for standalone (thread-per-camera) use."""
         while self.running:
-            # Connect if not connected
+            if not self.capture_once() and not self.is_connected:
+                time.sleep(config.CAMERA_RECONNECT_DELAY)
+
+    def capture_once(self):
+        """
+        Connect if needed, then capture and publish a single frame.
+
+        Returns:
+            bool: True if a frame was published
+        """
+        if not self.is_connected:
+            # A blocking VideoCapture open stalls every other camera the
+            # coordinator services, so reconnects are paced at one attempt
+            # per CAMERA_RECONNECT_DELAY and cameras that exhausted their
+            # attempts are skipped outright
+            if self.reconnect_attempts >= config.CAMERA_RECONNECT_ATTEMPTS:
+                return False
+            now = time.monotonic()
+            if now < self._next_reconnect_time:
+                return False
+            self._next_reconnect_time = now + config.CAMERA_RECONNECT_DELAY
+            self._connect()
             if not self.is_connected:
-                self._connect()
-                if not self.is_connected:
-                    time.sleep(config.CAMERA_RECONNECT_DELAY)
-                    continue
-            
-            # Capture frame
-            ret, frame = self.cap.read()
-            
-            if ret:
-                self.frame = frame
-                self.last_frame_time = datetime.now()
-                self.reconnect_attempts = 0
-            else:
-                print(f"[WARNING] {self.camera_id} frame capture failed")
-                self.is_connected = False
-                if self.cap:
-                    self.cap.release()
+                return False
+
+        # Capture frame: grab() advances past anything the backend has
+        # buffered without decoding it, then retrieve() decodes only the
+        # frame we actually publish
+        ret = self.cap.grab()
+        if ret:
+            ret, frame = self.cap.retrieve()
+
+        if ret:
+            # Write into the spare slot, then publish by bumping the index
+            idx = self._write_idx
+            self._slots[idx & 1] = frame
+            self._write_idx = idx + 1
+            # monotonic float: no datetime allocation per captured frame
+            self.last_frame_time = time.monotonic()
+            self.reconnect_attempts = 0
+            return True
+
+        print(f"[WARNING] {self.camera_id} frame capture failed")
+        self.is_connected = False
+        if self.cap:
+            self.cap.release()
+        return False
     
     def _connect(self):
-        """Attempt to connect to camera."""
-        if self.reconnect_attempts >= config.CAMERA_RECONNECT_ATTEMPTS:
-            print(f"[ERROR] {self.camera_id} max reconnection attempts reached")
-            return
-        
+        """Attempt to connect to camera (pacing handled by capture_once)."""
         try:
             self.cap = cv2.VideoCapture(self.camera_index)
-            
+
+            # Keep at most one frame in the backend buffer; RTSP/FFmpeg
+            # otherwise queues several frames and read() returns stale ones,
+            # adding N frame-intervals of alert latency
+            self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
             if self.cap.isOpened():
                 # Test read
                 ret, _ = self.cap.read()
@@ -95,6 +132,12 @@ class CameraStream:
         except Exception as e:
             print(f"[ERROR] {self.camera_id} connection failed: {e}")
             self.reconnect_attempts += 1
+
+        # Report exhaustion once, when the last attempt fails, instead of
+        # once per coordinator pass
+        if (not self.is_connected
+                and self.reconnect_attempts >= config.CAMERA_RECONNECT_ATTEMPTS):
+            print(f"[ERROR] {self.camera_id} max reconnection attempts reached")
     
     def get_frame(self):
         """
@@ -103,7 +146,10 @@ class CameraStream:
         Returns:
             numpy.ndarray or None: Latest frame
         """
-        return self.frame
+        idx = self._write_idx
+        if idx == 0:
+            return None
+        return self._slots[(idx - 1) & 1]
     
     def is_alive(self):
         """Check if camera stream is alive and producing frames."""
@@ -114,8 +160,7 @@ class CameraStream:
             return False
         
         # Check if we've received a frame recently (within last 5 seconds)
-        time_diff = (datetime.now() - self.last_frame_time).total_seconds()
-        return time_diff < 5.0
+        return time.monotonic() - self.last_frame_time < 5.0
 
 
 class CameraManager:
@@ -124,6 +169,10 @@ class CameraManager:
     def __init__(self):
         self.cameras = {}
         self.active_camera_ids = []
+        # One coordinator thread services every camera instead of a blocking
+        # capture thread per camera
+        self._coordinator_thread = None
+        self._coordinator_running = False
     
     def add_camera(self, camera_id, camera_index):
         """
@@ -159,18 +208,49 @@ class CameraManager:
         return True
     
     def start_all(self):
-        """Start all camera streams."""
-        for camera_id, camera in self.cameras.items():
-            camera.start()
-        
-        print(f"[MANAGER] Started {len(self.cameras)} cameras")
-    
+        """Start the capture coordinator servicing all cameras."""
+        if self._coordinator_running:
+            print("[MANAGER] Capture coordinator already running")
+            return
+
+        self._coordinator_running = True
+        self._coordinator_thread = threading.Thread(
+            target=self._capture_coordinator, daemon=True
+        )
+        self._coordinator_thread.start()
+
+        print(f"[MANAGER] Capture coordinator started for {len(self.cameras)} cameras")
+
     def stop_all(self):
-        """Stop all camera streams."""
+        """Stop the coordinator and release all camera streams."""
+        self._coordinator_running = False
+        if self._coordinator_thread:
+            self._coordinator_thread.join(timeout=2.0)
+            self._coordinator_thread = None
+
         for camera in self.cameras.values():
             camera.stop()
-        
+
         print("[MANAGER] All cameras stopped")
+
+    def _capture_coordinator(self):
+        """
+        Round-robin capture across all cameras on a single thread.
+
+        One thread grabbing/retrieving in turn keeps the thread count
+        constant as cameras are added and avoids N capture threads
+        contending on the GIL during decode bursts.
+        """
+        while self._coordinator_running:
+            captured = False
+
+            for camera in list(self.cameras.values()):
+                if camera.capture_once():
+                    captured = True
+
+            # Back off briefly when no camera produced a frame
+            if not captured:
+                time.sleep(0.1)
     
     def get_frame(self, camera_id):
         """
@@ -211,10 +291,17 @@ class CameraManager:
         """
         status = {}
         for camera_id, camera in self.cameras.items():
+            # Convert the monotonic capture timestamp to wall-clock only
+            # here, where it is actually reported
+            last_frame_time = None
+            if camera.last_frame_time is not None:
+                age = time.monotonic() - camera.last_frame_time
+                last_frame_time = datetime.now() - timedelta(seconds=age)
+
             status[camera_id] = {
                 "is_alive": camera.is_alive(),
                 "is_connected": camera.is_connected,
-                "last_frame_time": camera.last_frame_time,
+                "last_frame_time": last_frame_time,
                 "reconnect_attempts": camera.reconnect_attempts
             }
         
@@ -231,17 +318,19 @@ class CameraManager:
         Returns:
             list: Available camera indexes
         """
-        available = []
-        
-        for i in range(max_test):
-            cap = cv2.VideoCapture(i)
-            if cap.isOpened():
-                ret, _ = cap.read()
-                if ret:
-                    available.append(i)
-                cap.release()
-        
-        return available
+        def _probe(index):
+            cap = cv2.VideoCapture(index)
+            ok = cap.isOpened() and cap.read()[0]
+            cap.release()
+            return index if ok else None
+
+        # Probe all indexes concurrently: a missing device can block for
+        # seconds in the driver, so sequential scanning pays the sum of the
+        # timeouts while this pays only the slowest single probe
+        with ThreadPoolExecutor(max_workers=max_test) as executor:
+            results = executor.map(_probe, range(max_test))
+
+        return [i for i in results if i is not None]
     
     def auto_detect_and_add_cameras(self):
         """Automatically detect and add available cameras."""
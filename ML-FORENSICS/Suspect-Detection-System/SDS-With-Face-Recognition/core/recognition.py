@@ -5,16 +5,60 @@ Handles real-time detection with occlusion awareness
 
 import cv2
 import numpy as np
-from scipy.spatial.distance import cosine
+
+# Optional SIMD distance backend (AVX-512/NEON cosine kernels); the BLAS
+# matmul path is used when it is not installed
+try:
+    import simsimd
+except ImportError:
+    simsimd = None
+
+# Optional GPU backend for watchlist matching; used when installed and
+# config.GPU_ENABLED is set
+try:
+    import cupy
+except ImportError:
+    cupy = None
+
 from insightface.app import FaceAnalysis
 import config
 from datetime import datetime
+from functools import lru_cache
 import hashlib
 
+_FONT = cv2.FONT_HERSHEY_SIMPLEX
+
+
+@lru_cache(maxsize=4096)
+def _detection_label(person_id, conf_bucket):
+    """
+    Cached box label; confidence is bucketed to 1/100 so consecutive
+    frames of the same track reuse one string instead of formatting a
+    new one per draw.
+    """
+    if conf_bucket is None:
+        return f"{person_id}"
+    return f"{person_id} ({conf_bucket / 100:.2f})"
+
+
+@lru_cache(maxsize=64)
+def _occlusion_label(occlusion_level, mask_detected):
+    """Cached occlusion indicator text (few distinct combinations)."""
+    indicator = f"Occlusion: {occlusion_level}"
+    if mask_detected:
+        indicator += " [MASK]"
+    return indicator
+
 
 class OcclusionDetector:
     """Estimates face occlusion level using facial landmarks."""
-    
+
+    def __init__(self):
+        # HSV scratch reused across calls; cvtColor otherwise allocates a
+        # fresh output buffer for every face on every frame. Face sizes
+        # are stable frame to frame, so the shape check almost always hits.
+        self._hsv_scratch = None
+
     @staticmethod
     def estimate_occlusion(face):
         """
@@ -41,8 +85,7 @@ class OcclusionDetector:
         else:
             return "severe", 0.55
     
-    @staticmethod
-    def check_mask_presence(face, frame):
+    def check_mask_presence(self, face, frame):
         """
         Check if person is wearing a mask using simple heuristics.
         
@@ -61,30 +104,95 @@ class OcclusionDetector:
         x1, y1 = max(0, x1), max(0, y1)
         x2, y2 = min(w, x2), min(h, y2)
         
-        face_region = frame[y1:y2, x1:x2]
-        
-        if face_region.size == 0:
+        # Slice the lower half of the face (where a mask would be)
+        # straight out of the frame; the intermediate full-face view and
+        # second crop bought nothing
+        lower_y = y1 + int((y2 - y1) * 0.5)
+        lower_region = frame[lower_y:y2, x1:x2]
+
+        if lower_region.size == 0:
             return False
         
-        # Check lower half of face (where mask would be)
-        face_h = y2 - y1
-        lower_half_y = int(face_h * 0.5)
-        lower_region = face_region[lower_half_y:, :]
-        
-        # Convert to HSV for better color detection
-        hsv = cv2.cvtColor(lower_region, cv2.COLOR_BGR2HSV)
-        
-        # Detect typical mask colors (blue, white, black)
-        # More strict thresholds to reduce false positives
-        blue_mask = cv2.inRange(hsv, (100, 80, 80), (130, 255, 255))
-        white_mask = cv2.inRange(hsv, (0, 0, 220), (180, 30, 255))
-        black_mask = cv2.inRange(hsv, (0, 0, 0), (180, 50, 40))
-        
-        combined = cv2.bitwise_or(blue_mask, cv2.bitwise_or(white_mask, black_mask))
-        mask_percentage = np.count_nonzero(combined) / combined.size
-        
+        # Convert to HSV for better color detection, reusing the scratch
+        # buffer whenever the region shape matches the previous call
+        scratch = self._hsv_scratch
+        if scratch is None or scratch.shape != lower_region.shape:
+            scratch = np.empty_like(lower_region)
+            self._hsv_scratch = scratch
+        hsv = cv2.cvtColor(lower_region, cv2.COLOR_BGR2HSV, dst=scratch)
+
+        # Detect typical mask colors (blue, white, black) in one fused
+        # boolean pass; three cv2.inRange calls plus two bitwise_or merges
+        # would allocate five intermediate masks and walk the pixels four
+        # times. Thresholds are strict to reduce false positives.
+        h_ch = hsv[:, :, 0]
+        s_ch = hsv[:, :, 1]
+        v_ch = hsv[:, :, 2]
+        blue = (h_ch >= 100) & (h_ch <= 130) & (s_ch >= 80) & (v_ch >= 80)
+        white = (s_ch <= 30) & (v_ch >= 220)
+        black = (s_ch <= 50) & (v_ch <= 40)
+        mask_pixels = np.count_nonzero(blue | white | black)
+
         # Require at least 50% coverage to consider it a mask (more strict)
-        return mask_percentage > 0.50
+        return mask_pixels > 0.50 * h_ch.size
+
+
+class FrameDetections:
+    """
+    Column-oriented (structure-of-arrays) view of one frame's detections.
+
+    Embeddings, boxes and scores live in parallel arrays so aggregation
+    passes read contiguous columns instead of hashing into K dicts;
+    per-detection dicts are materialized only at the boundary for the
+    alert/report consumers, which remain dict-based.
+    """
+
+    def __init__(self, camera_id, timestamp, embeddings, bboxes,
+                 person_ids, confidences, distances, thresholds,
+                 occlusion_levels, occlusion_percentages, mask_flags,
+                 occlusion_adjusted, detection_scores, region_hashes=None):
+        self.camera_id = camera_id
+        self.timestamp = timestamp
+        self.embeddings = embeddings
+        self.bboxes = bboxes
+        self.person_ids = person_ids
+        self.confidences = confidences
+        self.distances = distances
+        self.thresholds = thresholds
+        self.occlusion_levels = occlusion_levels
+        self.occlusion_percentages = occlusion_percentages
+        self.mask_flags = mask_flags
+        self.occlusion_adjusted = occlusion_adjusted
+        self.detection_scores = detection_scores
+        # Filled lazily by consumers that persist evidence hashes (the
+        # tracer report); the live path never hashes per detection
+        self.region_hashes = region_hashes
+
+    def __len__(self):
+        return len(self.person_ids)
+
+    def to_dicts(self):
+        """Materialize the per-detection dicts consumed downstream."""
+        return [
+            {
+                "camera_id": self.camera_id,
+                "timestamp": self.timestamp,
+                "bbox": self.bboxes[i].tolist(),
+                "embedding": self.embeddings[i],
+                "person_id": self.person_ids[i],
+                "confidence": float(self.confidences[i]),
+                "distance": float(self.distances[i]),
+                "threshold_used": float(self.thresholds[i]),
+                "occlusion_level": self.occlusion_levels[i],
+                "occlusion_percentage": float(self.occlusion_percentages[i]),
+                "mask_detected": self.mask_flags[i],
+                "occlusion_adjusted": self.occlusion_adjusted[i],
+                "detection_score": float(self.detection_scores[i]),
+                "region_hash": (self.region_hashes[i]
+                                if self.region_hashes is not None else None)
+            }
+            for i in range(len(self.person_ids))
+        ]
 
 
 class FaceRecognitionEngine:
@@ -97,14 +205,75 @@ class FaceRecognitionEngine:
         Args:
             embeddings_data: Dictionary with 'embeddings' and 'person_ids'
         """
-        self.known_embeddings = embeddings_data["embeddings"]
         self.known_person_ids = embeddings_data["person_ids"]
         self.model_name = embeddings_data.get("model", "unknown")
+
+        # Watchlist embeddings live only as one contiguous L2-normalized
+        # float32 matrix: every distance kernel reads a single sequential
+        # buffer, and the loader's list-of-arrays copy can be collected.
+        # Matching a query is a single BLAS matrix-vector product instead
+        # of one scipy cosine() call per enrollee.
+        #
+        # Storage precision per backend: float32 here because NumPy's
+        # BLAS has no fp16 GEMV and float16 operands would be upcast per
+        # call; the SimSIMD copy is int8 (quarter bandwidth, VNNI) and
+        # the CuPy copy is fp16 (tensor cores), both derived from this
+        # matrix below.
+        embeddings = embeddings_data["embeddings"]
+        if len(embeddings) > 0:
+            mat = np.ascontiguousarray(np.stack(embeddings),
+                                       dtype=np.float32)
+            mat /= np.linalg.norm(mat, axis=1, keepdims=True)
+            self._known_mat = mat
+            # Preallocated output for single-query matching: on small
+            # watchlists the product itself is cheap and the per-call
+            # result allocation is a measurable share of the cost
+            self._sims_buf = np.empty(mat.shape[0], dtype=np.float32)
+        else:
+            self._known_mat = None
+            self._sims_buf = None
+
+        # int8 copy for the SimSIMD backend: a quarter of the float32
+        # memory traffic and eligible for VNNI dot-product instructions.
+        # On unit-normalized embeddings the quantization error is well
+        # inside the match-threshold margin. The NumPy path keeps float32,
+        # where int8 operands would just be upcast again.
+        if simsimd is not None and self._known_mat is not None:
+            self._i8_scale = 127.0 / float(np.max(np.abs(self._known_mat)))
+            self._known_i8 = np.round(
+                self._known_mat * self._i8_scale).astype(np.int8)
+        else:
+            self._i8_scale = None
+            self._known_i8 = None
+
+        # Device-resident fp16 copy for the CuPy backend: detection is
+        # already on GPU when ctx_id=0, so matching there too means only
+        # the winning indices and scores cross back to the host
+        if (cupy is not None and config.GPU_ENABLED
+                and self._known_mat is not None):
+            self._known_mat_gpu = cupy.asarray(self._known_mat,
+                                               dtype=cupy.float16)
+        else:
+            self._known_mat_gpu = None
+
+        # Bind the distance backend exactly once, preferring GPU, then
+        # SimSIMD int8, then the BLAS float32 path; the hot path then
+        # calls through these without any per-query availability checks
+        if self._known_mat_gpu is not None:
+            self._match_one = self._match_one_gpu
+            self._match_many = self._match_many_gpu
+        elif self._known_i8 is not None:
+            self._match_one = self._match_one_i8
+            self._match_many = self._match_many_i8
+        else:
+            self._match_one = self._match_one_f32
+            self._match_many = self._match_many_f32
         
         self.face_analyzer = None
         self.occlusion_detector = OcclusionDetector()
         
-        print(f"[ENGINE] Recognition engine initialized with {len(self.known_embeddings)} embeddings")
+        num_embeddings = 0 if self._known_mat is None else self._known_mat.shape[0]
+        print(f"[ENGINE] Recognition engine initialized with {num_embeddings} embeddings")
     
     def _init_face_analyzer(self):
         """Lazy initialization of face analyzer."""
@@ -152,45 +321,132 @@ class FaceRecognitionEngine:
                 "occlusion_adjusted": whether adjustment was made
             }
         """
-        if len(self.known_embeddings) == 0:
-            return {
-                "person_id": None,
-                "confidence": 0.0,
-                "distance": 1.0,
-                "threshold_used": config.MATCH_CONFIDENCE_THRESHOLD,
-                "occlusion_adjusted": False
-            }
-        
-        # Calculate distances to all known embeddings
-        distances = [cosine(face_embedding, known_emb) 
-                    for known_emb in self.known_embeddings]
-        
-        min_distance = min(distances)
-        min_index = distances.index(min_distance)
+        if self._known_mat is None:
+            return self._no_match_result()
+
+        # Normalize the query once; the watchlist rows were normalized at
+        # load time, so cosine collapses to 1 - dot and no per-candidate
+        # norm is ever recomputed
+        query = np.asarray(face_embedding, dtype=np.float32)
+        query_norm = float(np.linalg.norm(query))
+        if query_norm == 0.0:
+            return self._no_match_result()
+        query = query / query_norm
+
+        min_index, min_distance = self._match_one(query)
+
+        return self._match_result(min_index, min_distance,
+                                  adjust_for_occlusion, occlusion_level)
+
+    def recognize_faces_batch(self, face_embeddings, occlusion_levels):
+        """
+        Match several face embeddings against the watchlist at once.
+
+        Stacks the queries into a (K, D) matrix and issues a single
+        matrix product against the watchlist, so crowded frames pay one
+        BLAS dispatch instead of one per face.
+
+        Args:
+            face_embeddings: List of embedding vectors
+            occlusion_levels: Occlusion level per embedding
+
+        Returns:
+            List of recognition result dicts (same shape as recognize_face)
+        """
+        if self._known_mat is None or len(face_embeddings) == 0:
+            return [self._no_match_result() for _ in face_embeddings]
+
+        queries = np.stack(
+            [np.asarray(e, dtype=np.float32) for e in face_embeddings])
+        norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        norms[norms == 0.0] = 1.0
+        queries /= norms
+
+        indices, min_distances = self._match_many(queries)
+
+        return [
+            self._match_result(int(idx), float(dist), True, level)
+            for idx, dist, level in zip(indices, min_distances, occlusion_levels)
+        ]
+
+    # ----- Distance backends (one pair bound at init) -----
+
+    def _match_one_gpu(self, query):
+        sims_gpu = self._known_mat_gpu @ cupy.asarray(query,
+                                                      dtype=cupy.float16)
+        min_index = int(cupy.argmax(sims_gpu))
+        return min_index, 1.0 - float(sims_gpu[min_index])
+
+    def _match_one_i8(self, query):
+        q_i8 = np.round(query * self._i8_scale).astype(np.int8)
+        distances = np.asarray(
+            simsimd.cdist(q_i8[None, :], self._known_i8, metric="cosine")
+        ).ravel()
+        min_index = int(np.argmin(distances))
+        return min_index, float(distances[min_index])
+
+    def _match_one_f32(self, query):
+        similarities = np.dot(self._known_mat, query, out=self._sims_buf)
+        min_index = int(np.argmax(similarities))
+        return min_index, 1.0 - float(similarities[min_index])
+
+    def _match_many_gpu(self, queries):
+        q_gpu = cupy.asarray(queries, dtype=cupy.float16)
+        sims_gpu = q_gpu @ self._known_mat_gpu.T
+        indices_gpu = cupy.argmax(sims_gpu, axis=1)
+        best = sims_gpu[cupy.arange(len(queries)), indices_gpu]
+        return cupy.asnumpy(indices_gpu), \
+            1.0 - cupy.asnumpy(best).astype(np.float32)
+
+    def _match_many_i8(self, queries):
+        q_i8 = np.round(queries * self._i8_scale).astype(np.int8)
+        distances = np.asarray(
+            simsimd.cdist(q_i8, self._known_i8, metric="cosine"))
+        indices = np.argmin(distances, axis=1)
+        return indices, distances[np.arange(len(indices)), indices]
+
+    def _match_many_f32(self, queries):
+        similarities = queries @ self._known_mat.T
+        indices = np.argmax(similarities, axis=1)
+        return indices, 1.0 - similarities[np.arange(len(indices)), indices]
+
+    @staticmethod
+    def _no_match_result():
+        """Result dict for an empty watchlist or degenerate embedding."""
+        return {
+            "person_id": None,
+            "confidence": 0.0,
+            "distance": 1.0,
+            "threshold_used": config.MATCH_CONFIDENCE_THRESHOLD,
+            "occlusion_adjusted": False
+        }
+
+    def _match_result(self, min_index, min_distance, adjust_for_occlusion,
+                      occlusion_level):
+        """Build the recognition result dict for a best-match candidate."""
         matched_person_id = self.known_person_ids[min_index]
-        
+
         # Convert distance to confidence (1 - distance)
         confidence = 1.0 - min_distance
-        
+
         # Adjust threshold based on occlusion
         threshold = config.MATCH_CONFIDENCE_THRESHOLD
         occlusion_adjusted = False
-        
+
         if adjust_for_occlusion and config.ADJUST_THRESHOLD_FOR_OCCLUSION:
             penalty = config.OCCLUSION_CONFIDENCE_PENALTY.get(occlusion_level, 0.0)
             threshold = threshold + penalty
             occlusion_adjusted = penalty > 0.0
-        
+
         # Determine if match is valid
         is_match = confidence >= threshold
-        
+
         return {
             "person_id": matched_person_id if is_match else None,
             "confidence": confidence,
             "distance": min_distance,
             "threshold_used": threshold,
-            "occlusion_adjusted": occlusion_adjusted,
-            "all_distances": distances  # For debugging
+            "occlusion_adjusted": occlusion_adjusted
         }
     
     def process_frame(self, frame, camera_id="unknown"):
@@ -204,48 +460,80 @@ class FaceRecognitionEngine:
         Returns:
             List of detection results
         """
-        detections = []
-        
         faces = self.detect_faces(frame)
-        
-        for face in faces:
-            # Extract face embedding
-            embedding = face.embedding
-            
-            # Detect occlusion
-            occlusion_level, occlusion_pct = self.occlusion_detector.estimate_occlusion(face)
-            mask_detected = self.occlusion_detector.check_mask_presence(face, frame)
-            
-            # Recognize face
-            recognition_result = self.recognize_face(
-                embedding, 
-                adjust_for_occlusion=True,
-                occlusion_level=occlusion_level
-            )
-            
-            # Get bounding box
-            bbox = list(map(int, face.bbox))
-            
-            detection = {
-                "camera_id": camera_id,
-                "timestamp": datetime.now().isoformat(),
-                "bbox": bbox,
-                "embedding": embedding,
-                "person_id": recognition_result["person_id"],
-                "confidence": recognition_result["confidence"],
-                "distance": recognition_result["distance"],
-                "threshold_used": recognition_result["threshold_used"],
-                "occlusion_level": occlusion_level,
-                "occlusion_percentage": occlusion_pct,
-                "mask_detected": mask_detected,
-                "occlusion_adjusted": recognition_result["occlusion_adjusted"],
-                "detection_score": face.det_score if hasattr(face, 'det_score') else 1.0
-            }
-            
-            detections.append(detection)
-        
-        return detections
+        if not faces:
+            return []
+
+        # Detect occlusion first, then match every face in the frame with
+        # one batched watchlist query instead of K separate ones
+        occlusion_info = [self.occlusion_detector.estimate_occlusion(face)
+                          for face in faces]
+        recognition_results = self.recognize_faces_batch(
+            [face.embedding for face in faces],
+            [level for level, _ in occlusion_info]
+        )
+
+        # The HSV color pass is the expensive heuristic; a detection
+        # score high enough to rate "none" occlusion means the lower
+        # face is fully visible, so skip it in the common case
+        mask_flags = [
+            False if occlusion_level == "none"
+            else self.occlusion_detector.check_mask_presence(face, frame)
+            for face, (occlusion_level, _) in zip(faces, occlusion_info)
+        ]
+
+        bboxes = np.array([face.bbox for face in faces]).astype(np.int32)
+
+        # Populate the columns directly from the batched outputs; every
+        # face in the frame shares one capture timestamp
+        frame_detections = FrameDetections(
+            camera_id=camera_id,
+            timestamp=datetime.now().isoformat(),
+            embeddings=np.stack([face.embedding for face in faces]),
+            bboxes=bboxes,
+            person_ids=[r["person_id"] for r in recognition_results],
+            confidences=np.array(
+                [r["confidence"] for r in recognition_results],
+                dtype=np.float32),
+            distances=np.array(
+                [r["distance"] for r in recognition_results],
+                dtype=np.float32),
+            thresholds=np.array(
+                [r["threshold_used"] for r in recognition_results],
+                dtype=np.float32),
+            occlusion_levels=[level for level, _ in occlusion_info],
+            occlusion_percentages=np.array(
+                [pct for _, pct in occlusion_info], dtype=np.float32),
+            mask_flags=mask_flags,
+            occlusion_adjusted=[r["occlusion_adjusted"]
+                                for r in recognition_results],
+            detection_scores=np.array(
+                [face.det_score if hasattr(face, 'det_score') else 1.0
+                 for face in faces], dtype=np.float32)
+        )
+
+        return frame_detections.to_dicts()
     
+    def process_frames_batch(self, frames, camera_id="unknown"):
+        """
+        Process a batch of frames and return detections per frame.
+
+        InsightFace's FaceAnalysis does not expose a batched forward pass,
+        so the batch is iterated internally; batching still amortizes the
+        analyzer setup checks and gives offline callers (the tracer) one
+        call site where a batched GPU backend can be dropped in later.
+
+        Args:
+            frames: List of OpenCV images
+            camera_id: Identifier for the camera
+
+        Returns:
+            List of detection lists, one per input frame
+        """
+        self._init_face_analyzer()
+
+        return [self.process_frame(frame, camera_id) for frame in frames]
+
     def draw_detection_on_frame(self, frame, detection, show_confidence=True):
         """
         Draw detection box and information on frame.
@@ -277,9 +565,10 @@ class FaceRecognitionEngine:
             else:
                 color = (0, 255, 255)  # Yellow for low
             
-            label = f"{person_id}"
             if show_confidence:
-                label += f" ({confidence:.2f})"
+                label = _detection_label(person_id, round(confidence * 100))
+            else:
+                label = _detection_label(person_id, None)
         
         # Draw bounding box
         cv2.rectangle(frame, (x1, y1), (x2, y2), color, 2)
@@ -290,16 +579,13 @@ class FaceRecognitionEngine:
         
         # Draw label text
         cv2.putText(frame, label, (x1 + 5, y1 - 7),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
-        
+                   _FONT, 0.5, (255, 255, 255), 1)
+
         # Draw occlusion indicator
         if occlusion_level != "none" or mask_detected:
-            indicator = f"Occlusion: {occlusion_level}"
-            if mask_detected:
-                indicator += " [MASK]"
-            
+            indicator = _occlusion_label(occlusion_level, mask_detected)
             cv2.putText(frame, indicator, (x1, y2 + 15),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.4, color, 1)
+                       _FONT, 0.4, color, 1)
         
         return frame
     
@@ -315,10 +601,54 @@ class FaceRecognitionEngine:
             str: SHA-256 hash
         """
         if config.ENABLE_FRAME_HASHING:
-            frame_bytes = frame.tobytes()
-            return hashlib.sha256(frame_bytes).hexdigest()
+            return FaceRecognitionEngine._hash_buffer(frame)
         return None
 
+    @staticmethod
+    def hash_region(frame, bbox):
+        """
+        Hash only the evidence region of a frame.
+
+        A face ROI is hundreds of KB against several MB for a full
+        frame, so per-detection evidence hashes stay cheap; whole-frame
+        integrity hashing remains available via hash_frame.
+
+        Args:
+            frame: OpenCV image
+            bbox: (x1, y1, x2, y2) region bounds
+
+        Returns:
+            str: SHA-256 hash of the region, or None
+        """
+        if not config.ENABLE_FRAME_HASHING:
+            return None
+
+        x1, y1, x2, y2 = bbox
+        h, w = frame.shape[:2]
+        x1, y1 = max(0, int(x1)), max(0, int(y1))
+        x2, y2 = min(w, int(x2)), min(h, int(y2))
+
+        region = frame[y1:y2, x1:x2]
+        if region.size == 0:
+            return None
+        return FaceRecognitionEngine._hash_buffer(region)
+
+    @staticmethod
+    def _hash_buffer(array):
+        """SHA-256 of an array buffer, streamed in 64 KB slices."""
+        # Feed OpenSSL's SHA-256 (hardware SHA extensions where the
+        # platform has them) straight from the buffer in 64 KB slices so
+        # the hash streams through L2; no tobytes() copy is made for
+        # contiguous arrays
+        if not array.flags["C_CONTIGUOUS"]:
+            array = np.ascontiguousarray(array)
+        view = memoryview(array).cast("B")
+        digest = hashlib.sha256()
+        step = 1 << 16
+        for offset in range(0, len(view), step):
+            digest.update(view[offset:offset + step])
+        return digest.hexdigest()
+
 
 # ==================== TESTING UTILITIES ====================
 
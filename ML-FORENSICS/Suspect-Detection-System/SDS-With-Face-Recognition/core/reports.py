@@ -5,6 +5,7 @@ Generates comprehensive reports of detections and alerts
 
 import os
 import json
+from collections import Counter
 from datetime import datetime
 from docx import Document
 from docx.shared import Inches, Pt, RGBColor
@@ -38,10 +39,11 @@ class ReportGenerator:
         Returns:
             str: Path to generated report
         """
-        # Get alerts in time range
-        alerts = [a for a in self.alert_manager.alert_history 
-                 if session_start <= datetime.fromisoformat(a["timestamp"]) <= session_end]
-        
+        # Get alerts in time range: the alert history is kept sorted with
+        # a parallel epoch index, so the window is two binary searches
+        # instead of an ISO-8601 parse per alert
+        alerts = self.alert_manager.get_alerts_between(session_start, session_end)
+
         if output_format == "docx":
             return self._generate_docx_report(alerts, session_start, session_end)
         elif output_format == "json":
@@ -63,9 +65,8 @@ class ReportGenerator:
         session_start = session_end - timedelta(hours=24)
         
         # Get alerts in time range
-        alerts = [a for a in self.alert_manager.alert_history 
-                 if session_start <= datetime.fromisoformat(a["timestamp"]) <= session_end]
-        
+        alerts = self.alert_manager.get_alerts_between(session_start, session_end)
+
         if not alerts:
             return None
         
@@ -101,23 +102,15 @@ class ReportGenerator:
         # Summary Statistics
         doc.add_heading('Summary Statistics', 1)
         
-        # Count by risk level
-        risk_counts = {}
+        # Tally risk level, legal status and camera in a single pass
+        # instead of walking the alert list once per statistic
+        risk_counts = Counter()
+        status_counts = Counter()
+        camera_counts = Counter()
         for alert in alerts:
-            risk = alert["risk_level"]
-            risk_counts[risk] = risk_counts.get(risk, 0) + 1
-        
-        # Count by legal status
-        status_counts = {}
-        for alert in alerts:
-            status = alert["legal_status"]
-            status_counts[status] = status_counts.get(status, 0) + 1
-        
-        # Count by camera
-        camera_counts = {}
-        for alert in alerts:
-            camera = alert["camera_id"]
-            camera_counts[camera] = camera_counts.get(camera, 0) + 1
+            risk_counts[alert["risk_level"]] += 1
+            status_counts[alert["legal_status"]] += 1
+            camera_counts[alert["camera_id"]] += 1
         
         # Risk level table
         doc.add_heading('Alerts by Risk Level', 2)
@@ -209,13 +202,27 @@ class ReportGenerator:
         filename = f"detection_report_{timestamp}.docx"
         filepath = os.path.join(config.EVIDENCE_DIR, filename)
         
+        # Report generation is an interactive endpoint: save before
+        # reporting success so the returned filename exists and a failed
+        # save surfaces to the caller instead of dying in a worker
         doc.save(filepath)
-        
+
         print(f"[REPORT] Generated DOCX report: {filepath}")
         return filepath
     
     def _generate_json_report(self, alerts, session_start, session_end):
         """Generate JSON format report."""
+        # All four statistics fall out of one pass over the alerts
+        risk_counts = Counter()
+        status_counts = Counter()
+        camera_counts = Counter()
+        unique_persons = set()
+        for alert in alerts:
+            risk_counts[alert["risk_level"]] += 1
+            status_counts[alert["legal_status"]] += 1
+            camera_counts[alert["camera_id"]] += 1
+            unique_persons.add(alert["person_id"])
+
         report = {
             "report_metadata": {
                 "generated_at": datetime.now().isoformat(),
@@ -227,37 +234,30 @@ class ReportGenerator:
             },
             "statistics": {
                 "total_alerts": len(alerts),
-                "alerts_by_risk": {},
-                "alerts_by_status": {},
-                "alerts_by_camera": {},
-                "unique_persons_detected": len(set(a["person_id"] for a in alerts))
+                "alerts_by_risk": dict(risk_counts),
+                "alerts_by_status": dict(status_counts),
+                "alerts_by_camera": dict(camera_counts),
+                "unique_persons_detected": len(unique_persons)
             },
             "alerts": alerts
         }
         
-        # Calculate statistics
-        for alert in alerts:
-            risk = alert["risk_level"]
-            status = alert["legal_status"]
-            camera = alert["camera_id"]
-            
-            report["statistics"]["alerts_by_risk"][risk] = \
-                report["statistics"]["alerts_by_risk"].get(risk, 0) + 1
-            report["statistics"]["alerts_by_status"][status] = \
-                report["statistics"]["alerts_by_status"].get(status, 0) + 1
-            report["statistics"]["alerts_by_camera"][camera] = \
-                report["statistics"]["alerts_by_camera"].get(camera, 0) + 1
-        
         # Save report
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"detection_report_{timestamp}.json"
         filepath = os.path.join(config.EVIDENCE_DIR, filename)
         
-        with open(filepath, "w") as f:
-            json.dump(report, f, indent=2)
-        
+        # Save before reporting success (see the DOCX path)
+        self._write_json_report(report, filepath)
+
         print(f"[REPORT] Generated JSON report: {filepath}")
         return filepath
+
+    @staticmethod
+    def _write_json_report(report, filepath):
+        """Write a composed report dict to disk."""
+        with open(filepath, "w") as f:
+            json.dump(report, f, indent=2)
     
     def generate_live_session_report(self):
         """Generate report for current session (from system start)."""
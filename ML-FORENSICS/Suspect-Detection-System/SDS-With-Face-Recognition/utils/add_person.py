@@ -111,7 +111,15 @@ def interactive_add_person():
                 
                 if has_images == 'yes':
                     print(f"\nPlace images in: {config.DATA_DIR}/images/{person_id}/")
-                    print("Then run: python utils/build_embeddings.py")
+
+                    build_now = input("\nImages already in place? Extract embeddings now? (yes/no): ").strip().lower()
+
+                    if build_now == 'yes':
+                        # Incremental: processes only this person's folder
+                        # instead of rebuilding the whole database
+                        manager.add_person_embeddings(person_id)
+                    else:
+                        print("Then run: python utils/build_embeddings.py")
                 
             else:
                 print("\nX Failed to add person to watchlist.")
@@ -27,12 +27,16 @@ License: Academic/Research Use
 import os
 import re
 import json
+import mmap
+import atexit
 import hashlib
 import datetime
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from functools import lru_cache
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from enum import Enum
 
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
@@ -51,6 +55,22 @@ from Crypto.Cipher import AES
 from Crypto.Random import get_random_bytes
 from Crypto.Hash import SHA256
 
+# Optional: the cryptography package's OpenSSL backend is the most
+# consistently AES-NI/PCLMULQDQ-accelerated GCM available; when it is
+# installed we use it for bulk encryption and fall back to PyCryptodome
+# otherwise. Both paths produce the same nonce+tag+ciphertext layout.
+try:
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+except ImportError:
+    AESGCM = None
+
+# Optional: Numba JIT for the PSNR MSE reduction. Used automatically
+# when installed; NumPy handles it otherwise.
+try:
+    import numba
+except ImportError:
+    numba = None
+
 import smtplib
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
@@ -93,7 +113,14 @@ class ChainOfCustodyAction(Enum):
     VERIFIED = "verified"          # Integrity verification performed
 
 
-@dataclass
+# Value -> member tables for log reconstruction: calling the Enum class
+# per line goes through __call__ and _missing_ machinery, which adds up
+# when rebuilding long chains; a plain dict probe does not
+_ACTION_BY_VALUE = {action.value: action for action in ChainOfCustodyAction}
+_ROLE_BY_VALUE = {role.value: role for role in UserRole}
+
+
+@dataclass(slots=True)
 class CaseInformation:
     """Represents a forensic case"""
     case_id: str
@@ -108,8 +135,22 @@ class CaseInformation:
     case_status: str = "active"
     
     def to_dict(self) -> dict:
-        return asdict(self)
-    
+        # Literal dict instead of dataclasses.asdict: asdict deep-copies
+        # recursively, and these dicts are serialized and discarded
+        # immediately
+        return {
+            "case_id": self.case_id,
+            "case_name": self.case_name,
+            "case_number": self.case_number,
+            "investigating_agency": self.investigating_agency,
+            "lead_investigator": self.lead_investigator,
+            "case_opened_date": self.case_opened_date,
+            "incident_date": self.incident_date,
+            "incident_location": self.incident_location,
+            "case_description": self.case_description,
+            "case_status": self.case_status,
+        }
+
     def to_text(self) -> str:
         """Convert to text format for watermarking"""
         return (
@@ -125,7 +166,7 @@ class CaseInformation:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class EvidenceMetadata:
     """Metadata for a piece of digital evidence"""
     evidence_id: str
@@ -152,12 +193,27 @@ class EvidenceMetadata:
     access_count: int = 0
     
     def to_dict(self) -> dict:
-        data = asdict(self)
-        data['evidence_type'] = self.evidence_type.value
-        return data
-
-
-@dataclass
+        return {
+            "evidence_id": self.evidence_id,
+            "case_id": self.case_id,
+            "evidence_type": self.evidence_type.value,
+            "original_filename": self.original_filename,
+            "file_hash_sha256": self.file_hash_sha256,
+            "file_size_bytes": self.file_size_bytes,
+            "seized_datetime": self.seized_datetime,
+            "seized_by": self.seized_by,
+            "seized_location": self.seized_location,
+            "collection_device": self.collection_device,
+            "description": self.description,
+            "tags": self.tags,
+            "upload_datetime": self.upload_datetime,
+            "uploaded_by": self.uploaded_by,
+            "last_accessed": self.last_accessed,
+            "access_count": self.access_count,
+        }
+
+
+@dataclass(slots=True)
 class ChainOfCustodyEntry:
     """
     Immutable entry in the chain of custody log.
@@ -181,10 +237,20 @@ class ChainOfCustodyEntry:
     device_info: Optional[str] = None
     
     def to_dict(self) -> dict:
-        data = asdict(self)
-        data['action'] = self.action.value
-        data['user_role'] = self.user_role.value
-        return data
+        return {
+            "entry_id": self.entry_id,
+            "evidence_id": self.evidence_id,
+            "case_id": self.case_id,
+            "timestamp": self.timestamp,
+            "action": self.action.value,
+            "performed_by": self.performed_by,
+            "user_role": self.user_role.value,
+            "hash_before": self.hash_before,
+            "hash_after": self.hash_after,
+            "details": self.details,
+            "location": self.location,
+            "device_info": self.device_info,
+        }
     
     def is_tampering_detected(self) -> bool:
         """Check if this entry indicates potential tampering"""
@@ -214,8 +280,110 @@ class ChainOfCustodyManager:
     
     def __init__(self, log_file_path: str = "chain_of_custody.jsonl"):
         self.log_file = log_file_path
+        self._mm: Optional[mmap.mmap] = None
+        self._mm_size = -1
         self._ensure_log_exists()
-    
+        self._build_index()
+        # One long-lived append descriptor: every evidence interaction
+        # logs an entry, and a fresh open/close per entry is pure
+        # syscall overhead on the hot path
+        self._fd = os.open(self.log_file,
+                           os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o640)
+        atexit.register(os.close, self._fd)
+
+    def _log_view(self) -> Optional[mmap.mmap]:
+        """
+        Memory-mapped read view of the log, reopened after growth.
+
+        Repeated queries read from the shared OS page cache instead of
+        issuing fresh read syscalls per line; appends change the file
+        size, which triggers a cheap remap on the next access.
+        """
+        size = os.path.getsize(self.log_file)
+        if size == 0:
+            return None
+        if self._mm is None or self._mm_size != size:
+            if self._mm is not None:
+                self._mm.close()
+            with open(self.log_file, 'rb') as f:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._mm_size = size
+        return self._mm
+
+    def _build_index(self):
+        """
+        One streaming pass over the log building byte-offset indexes.
+
+        Every lookup used to re-read and re-parse the whole log; with
+        the index a query reads only the lines that belong to the
+        requested evidence or case, so queries scale with chain length
+        rather than total log size.
+        """
+        self._by_evidence: Dict[str, List[Tuple[int, int]]] = {}
+        self._by_case: Dict[str, List[Tuple[int, int]]] = {}
+        try:
+            mm = self._log_view()
+            if mm is None:
+                return
+            # The startup pass walks the whole file once; tell the
+            # kernel so it reads ahead in large contiguous chunks
+            if hasattr(mm, 'madvise'):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            mm.seek(0)
+            offset = 0
+            for line in iter(mm.readline, b""):
+                length = len(line)
+                if line.strip():
+                    data = json.loads(line)
+                    self._index_entry(data, offset, length)
+                offset += length
+            # Queries after startup jump straight to indexed offsets
+            if hasattr(mm, 'madvise'):
+                mm.madvise(mmap.MADV_RANDOM)
+        except Exception as e:
+            print(f"ERROR indexing chain of custody: {e}")
+
+    def _index_entry(self, data: dict, offset: int, length: int):
+        """Record one log line's location under its evidence and case ids"""
+        evidence_id = data.get('evidence_id')
+        if evidence_id:
+            self._by_evidence.setdefault(evidence_id, []).append((offset, length))
+        case_id = data.get('case_id')
+        if case_id:
+            self._by_case.setdefault(case_id, []).append((offset, length))
+
+    def _read_entries(self, locations: List[Tuple[int, int]]) -> List['ChainOfCustodyEntry']:
+        """Fetch and reconstruct only the indexed lines"""
+        entries = []
+        try:
+            mm = self._log_view()
+            if mm is None:
+                return entries
+            for offset, length in locations:
+                data = json.loads(mm[offset:offset + length])
+                entries.append(self._entry_from_dict(data))
+        except Exception as e:
+            print(f"ERROR reading chain of custody: {e}")
+        return entries
+
+    @staticmethod
+    def _entry_from_dict(data: dict) -> 'ChainOfCustodyEntry':
+        """Reconstruct an entry from its logged JSON form"""
+        return ChainOfCustodyEntry(
+            entry_id=data['entry_id'],
+            evidence_id=data['evidence_id'],
+            case_id=data['case_id'],
+            timestamp=data['timestamp'],
+            action=_ACTION_BY_VALUE[data['action']],
+            performed_by=data['performed_by'],
+            user_role=_ROLE_BY_VALUE[data['user_role']],
+            hash_before=data.get('hash_before'),
+            hash_after=data.get('hash_after'),
+            details=data['details'],
+            location=data.get('location'),
+            device_info=data.get('device_info')
+        )
+
     def _ensure_log_exists(self):
         """Create log file if it doesn't exist"""
         if not os.path.exists(self.log_file):
@@ -236,10 +404,16 @@ class ChainOfCustodyManager:
         Returns True if successfully logged, False otherwise.
         """
         try:
-            with open(self.log_file, 'a') as f:
-                entry_data = entry.to_dict()
-                entry_data['log_timestamp'] = datetime.datetime.now().isoformat()
-                f.write(json.dumps(entry_data) + "\n")
+            entry_data = entry.to_dict()
+            entry_data['log_timestamp'] = datetime.datetime.now().isoformat()
+            line = (json.dumps(entry_data) + "\n").encode('utf-8')
+            offset = os.lseek(self._fd, 0, os.SEEK_END)
+            os.write(self._fd, line)
+            # Routine ACCESSED-style events can ride the page cache;
+            # integrity verdicts must be durable before we report them
+            if entry.action == ChainOfCustodyAction.VERIFIED:
+                os.fsync(self._fd)
+            self._index_entry(entry_data, offset, len(line))
             return True
         except Exception as e:
             print(f"ERROR: Failed to log chain of custody entry: {e}")
@@ -247,62 +421,11 @@ class ChainOfCustodyManager:
     
     def get_entries_for_evidence(self, evidence_id: str) -> List[ChainOfCustodyEntry]:
         """Retrieve complete chain of custody for a specific piece of evidence"""
-        entries = []
-        try:
-            with open(self.log_file, 'r') as f:
-                for line in f:
-                    if line.strip():
-                        data = json.loads(line)
-                        if data.get('evidence_id') == evidence_id:
-                            # Reconstruct entry from JSON
-                            entry = ChainOfCustodyEntry(
-                                entry_id=data['entry_id'],
-                                evidence_id=data['evidence_id'],
-                                case_id=data['case_id'],
-                                timestamp=data['timestamp'],
-                                action=ChainOfCustodyAction(data['action']),
-                                performed_by=data['performed_by'],
-                                user_role=UserRole(data['user_role']),
-                                hash_before=data.get('hash_before'),
-                                hash_after=data.get('hash_after'),
-                                details=data['details'],
-                                location=data.get('location'),
-                                device_info=data.get('device_info')
-                            )
-                            entries.append(entry)
-        except Exception as e:
-            print(f"ERROR reading chain of custody: {e}")
-        
-        return entries
-    
+        return self._read_entries(self._by_evidence.get(evidence_id, []))
+
     def get_entries_for_case(self, case_id: str) -> List[ChainOfCustodyEntry]:
         """Retrieve all chain of custody entries for a case"""
-        entries = []
-        try:
-            with open(self.log_file, 'r') as f:
-                for line in f:
-                    if line.strip():
-                        data = json.loads(line)
-                        if data.get('case_id') == case_id:
-                            entry = ChainOfCustodyEntry(
-                                entry_id=data['entry_id'],
-                                evidence_id=data['evidence_id'],
-                                case_id=data['case_id'],
-                                timestamp=data['timestamp'],
-                                action=ChainOfCustodyAction(data['action']),
-                                performed_by=data['performed_by'],
-                                user_role=UserRole(data['user_role']),
-                                hash_before=data.get('hash_before'),
-                                hash_after=data.get('hash_after'),
-                                details=data['details'],
-                                location=data.get('location'),
-                                device_info=data.get('device_info')
-                            )
-                            entries.append(entry)
-        except Exception as e:
-            print(f"ERROR reading chain of custody: {e}")
-        
-        return entries
+        return self._read_entries(self._by_case.get(case_id, []))
     
     def verify_chain_integrity(self, evidence_id: str) -> Tuple[bool, List[str]]:
         """
@@ -368,6 +491,15 @@ class Logger:
 #  CRYPTOGRAPHIC UTILITIES
 # ============================================================
 
+# hashlib should be backed by OpenSSL (_hashlib), whose SHA-256 kernels
+# use the CPU's SHA extensions where available; the bundled pure-C
+# fallback is several times slower, which matters when hashing
+# gigabyte-scale medical scans on every upload and verification
+if not hashlib.sha256.__name__.startswith("openssl_"):
+    print("WARNING: hashlib is using the slow built-in SHA-256 fallback; "
+          "file hashing will be CPU-bound.")
+
+
 def compute_file_hash(filepath: str) -> str:
     """
     Compute SHA-256 hash of a file for integrity verification.
@@ -376,24 +508,107 @@ def compute_file_hash(filepath: str) -> str:
     sha256_hash = hashlib.sha256()
     try:
         with open(filepath, "rb") as f:
-            # Read in 64kb chunks for memory efficiency
-            for byte_block in iter(lambda: f.read(65536), b""):
+            # 1 MiB chunks: large enough that the Python loop overhead
+            # disappears next to OpenSSL's hashing of each block, small
+            # enough to stay cache-friendly
+            for byte_block in iter(lambda: f.read(1 << 20), b""):
                 sha256_hash.update(byte_block)
         return sha256_hash.hexdigest()
     except Exception as e:
         raise RuntimeError(f"Failed to compute hash: {e}")
 
 
+def compute_file_hash_parallel(filepath: str, segment_size: int = 16 << 20,
+                               workers: Optional[int] = None) -> str:
+    """
+    Merkle-style parallel SHA-256 for gigabyte-scale files.
+
+    The file is split into fixed-size segments hashed concurrently
+    (hashlib releases the GIL inside update), and the root is the
+    SHA-256 of the concatenated leaf digests. Tamper detection is
+    preserved: any changed byte changes its leaf and therefore the root.
+
+    NOTE: the digest is NOT interchangeable with compute_file_hash —
+    verification must use the same function (and segment_size) that
+    produced the stored value, so this is an opt-in utility rather
+    than a drop-in replacement for the hashes already in custody logs.
+    """
+    try:
+        file_size = os.path.getsize(filepath)
+        # Below one segment the tree degenerates and thread setup would
+        # only add overhead; fall back to the plain serial hash body
+        if file_size <= segment_size:
+            return compute_file_hash(filepath)
+
+        with open(filepath, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                view = memoryview(mm)
+                offsets = range(0, file_size, segment_size)
+
+                def _leaf(offset):
+                    return hashlib.sha256(
+                        view[offset:offset + segment_size]).digest()
+
+                with ThreadPoolExecutor(
+                        max_workers=workers or os.cpu_count()) as pool:
+                    leaves = list(pool.map(_leaf, offsets))
+                view.release()
+
+        return hashlib.sha256(b"".join(leaves)).hexdigest()
+    except Exception as e:
+        raise RuntimeError(f"Failed to compute parallel hash: {e}")
+
+
+def bytes_to_bits_np(b: bytes) -> np.ndarray:
+    """Convert bytes to a uint8 array of 0/1 bits (MSB-first)"""
+    return np.unpackbits(np.frombuffer(b, dtype=np.uint8))
+
+
+def bits_to_bytes_np(bits: np.ndarray) -> bytes:
+    """Convert a uint8 array of 0/1 bits back to bytes"""
+    if bits.size % 8 != 0:
+        raise ValueError("Bit length is not a multiple of 8.")
+    if bits.max(initial=0) > 1:
+        raise ValueError("Bitstream contains values other than 0/1.")
+    return np.packbits(bits).tobytes()
+
+
 def bytes_to_bits(b: bytes) -> str:
-    """Convert bytes to binary string representation"""
-    return ''.join(f'{byte:08b}' for byte in b)
+    """Convert bytes to binary string representation
+
+    Retained for callers that want a printable bitstream; the embed/
+    extract pipeline now stays in uint8 arrays (bytes_to_bits_np) so
+    bits are never round-tripped through ASCII.
+    """
+    # np.unpackbits is MSB-first, matching the former f'{byte:08b}'
+    # formatting loop; adding ord('0') maps 0/1 to ASCII '0'/'1' so the
+    # whole conversion is two C-level passes instead of a Python loop
+    return (bytes_to_bits_np(b) + np.uint8(ord('0'))).tobytes().decode('ascii')
 
 
 def bits_to_bytes(bits: str) -> bytes:
     """Convert binary string to bytes"""
-    if len(bits) % 8 != 0:
-        raise ValueError("Bit length is not a multiple of 8.")
-    return bytes(int(bits[i:i+8], 2) for i in range(0, len(bits), 8))
+    arr = np.frombuffer(bits.encode('ascii'), dtype=np.uint8) - np.uint8(ord('0'))
+    return bits_to_bytes_np(arr)
+
+
+def add_length_header_bits_np(data_bits: np.ndarray) -> np.ndarray:
+    """Prepend a 32-bit big-endian length header to a bit array"""
+    header = np.unpackbits(
+        np.array([data_bits.size], dtype='>u4').view(np.uint8)
+    )
+    return np.concatenate([header, data_bits])
+
+
+def remove_length_header_bits_np(bits: np.ndarray) -> np.ndarray:
+    """Strip the 32-bit length header from a bit array"""
+    if bits.size < 32:
+        raise ValueError("Bitstream too short to contain header.")
+    length = int(np.packbits(bits[:32]).view('>u4')[0])
+    data_bits = bits[32:32 + length]
+    if data_bits.size < length:
+        raise ValueError("Bitstream shorter than declared length.")
+    return data_bits
 
 
 def add_length_header_bits(data_bits: str) -> str:
@@ -418,8 +633,18 @@ def remove_length_header_bits(bits: str) -> str:
 #  AES ENCRYPTION (for evidence security)
 # ============================================================
 
+@lru_cache(maxsize=32)
 def derive_key_from_password(password: str) -> bytes:
-    """Derive AES key from password using SHA-256"""
+    """
+    Derive AES key from password using SHA-256.
+
+    The derivation itself must stay exactly as shipped: every already
+    sealed evidence file was encrypted under SHA-256(password), and a
+    stronger KDF (PBKDF2/Argon2) would need a salted, versioned file
+    format before existing evidence could still be opened. The cache
+    means a batch run over many evidence files derives each distinct
+    password once instead of once per file.
+    """
     h = SHA256.new()
     h.update(password.encode('utf-8'))
     return h.digest()
@@ -432,11 +657,48 @@ def aes_gcm_encrypt(data: bytes, password: str) -> bytes:
     """
     key = derive_key_from_password(password)
     nonce = get_random_bytes(12)
+    if AESGCM is not None:
+        # AESGCM returns ciphertext||tag; reorder to keep the existing
+        # nonce+tag+ciphertext file layout
+        sealed = AESGCM(key).encrypt(nonce, data, None)
+        return nonce + sealed[-16:] + sealed[:-16]
     cipher = AES.new(key, AES.MODE_GCM, nonce=nonce)
     ciphertext, tag = cipher.encrypt_and_digest(data)
     return nonce + tag + ciphertext
 
 
+def aes_gcm_encrypt_stream(in_path: str, out_path: str, password: str) -> None:
+    """
+    AES-GCM encrypt a file in 1 MiB chunks.
+    Output format: nonce (12) + tag (16) + ciphertext — identical to
+    aes_gcm_encrypt, so aes_gcm_decrypt opens the result unchanged.
+
+    Streaming keeps peak memory at one chunk instead of holding the
+    whole plaintext plus the whole ciphertext at once. The tag is only
+    known after the last chunk, so a placeholder is written at offset 12
+    and patched in with a seek once the stream is finished. Uses the
+    PyCryptodome cipher directly because the cryptography AESGCM one-shot
+    API has no incremental mode.
+    """
+    key = derive_key_from_password(password)
+    nonce = get_random_bytes(12)
+    cipher = AES.new(key, AES.MODE_GCM, nonce=nonce)
+
+    with open(in_path, "rb") as fin, open(out_path, "wb") as fout:
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(fin.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        fout.write(nonce)
+        fout.write(b"\x00" * 16)  # tag placeholder, patched below
+        while True:
+            chunk = fin.read(1 << 20)
+            if not chunk:
+                break
+            fout.write(cipher.encrypt(chunk))
+        tag = cipher.digest()
+        fout.seek(12)
+        fout.write(tag)
+
+
 def aes_gcm_decrypt(data: bytes, password: str) -> bytes:
     """Decrypt AES-GCM encrypted data"""
     if len(data) < 12 + 16:
@@ -445,6 +707,8 @@ def aes_gcm_decrypt(data: bytes, password: str) -> bytes:
     nonce = data[:12]
     tag = data[12:28]
     ciphertext = data[28:]
+    if AESGCM is not None:
+        return AESGCM(key).decrypt(nonce, ciphertext + tag, None)
     cipher = AES.new(key, AES.MODE_GCM, nonce=nonce)
     plaintext = cipher.decrypt_and_verify(ciphertext, tag)
     return plaintext
@@ -454,50 +718,119 @@ def aes_gcm_decrypt(data: bytes, password: str) -> bytes:
 #  LSB WATERMARKING (for evidence marking)
 # ============================================================
 
-def embed_bits_in_image(img: np.ndarray, bits: str) -> np.ndarray:
+def embed_bits_in_image(img: np.ndarray, bits) -> np.ndarray:
     """
     Embed bits in the LSB of a grayscale image.
     Used for marking evidence with case information.
+
+    Accepts either a uint8 array of 0/1 bits (the native pipeline
+    format) or a '0'/'1' string for backward compatibility.
     """
     if img.dtype != np.uint8:
         raise ValueError("Image should be uint8 for LSB embedding.")
 
+    if isinstance(bits, str):
+        bits_arr = np.frombuffer(bits.encode('ascii'), dtype=np.uint8) - np.uint8(ord('0'))
+    else:
+        bits_arr = np.asarray(bits, dtype=np.uint8)
+
     h, w = img.shape
-    flat = img.flatten().copy()
-    if len(bits) > flat.size:
+    flat = img.flatten()  # flatten always copies; the original is untouched
+    if bits_arr.size > flat.size:
         raise ValueError(
-            f"Not enough pixels to embed data. Bits: {len(bits)}, Pixels: {flat.size}"
+            f"Not enough pixels to embed data. Bits: {bits_arr.size}, Pixels: {flat.size}"
         )
 
-    for i, bit in enumerate(bits):
-        if bit == '1':
-            flat[i] |= 1 
-        else:
-            flat[i] &= 0xFE
+    # SWAR fast path: view the pixel prefix as uint64 and mask/or eight
+    # pixels per word. The 0xFE..FE mask and the 0/1 bit bytes operate
+    # byte-wise, so the result is endianness-neutral, and flat is a
+    # fresh contiguous buffer so the uint64 view is aligned.
+    n = bits_arr.size
+    n8 = n & ~7
+    if n8:
+        words = flat[:n8].view(np.uint64)
+        bit_words = np.ascontiguousarray(bits_arr[:n8]).view(np.uint64)
+        words &= np.uint64(0xFEFEFEFEFEFEFEFE)
+        words |= bit_words
+    if n8 < n:
+        # Tail of up to 7 bits stays on the byte-wise path
+        flat[n8:n] = (flat[n8:n] & np.uint8(0xFE)) | bits_arr[n8:]
 
     return flat.reshape((h, w))
 
 
-def extract_bits_from_image(img: np.ndarray, n_bits: int) -> str:
-    """Extract bits from LSB watermarked image"""
+def extract_bits_from_image_np(img: np.ndarray, n_bits: int) -> np.ndarray:
+    """Extract LSBs from a watermarked image as a uint8 array of 0/1"""
     if img.dtype != np.uint8:
         raise ValueError("Image should be uint8 for LSB extraction.")
-    flat = img.flatten()
+    flat = img.reshape(-1)
     if n_bits > flat.size:
         raise ValueError("Requested more bits than pixels.")
-    bits = ''.join('1' if (p & 1) else '0' for p in flat[:n_bits])
-    return bits
+    # One vectorized AND — replaces a generator evaluating (p & 1)
+    # per pixel
+    return flat[:n_bits] & np.uint8(1)
+
+
+def extract_bits_from_image(img: np.ndarray, n_bits: int) -> str:
+    """Extract bits from LSB watermarked image as a '0'/'1' string"""
+    lsb = extract_bits_from_image_np(img, n_bits)
+    return (lsb + np.uint8(ord('0'))).tobytes().decode('ascii')
 
 
 # ============================================================
 #  IMAGE QUALITY METRICS: PSNR & SSIM
 # ============================================================
 
+# SSIM always uses an 11x11 Gaussian window with sigma 1.5; build the
+# 1-D kernel once at import instead of re-deriving it inside every
+# GaussianBlur call
+_SSIM_KERNEL_1D = cv2.getGaussianKernel(11, 1.5).astype(np.float32)
+
+
+def _ssim_blur(img: np.ndarray) -> np.ndarray:
+    """Apply the SSIM Gaussian window as two separable 1-D passes."""
+    return cv2.sepFilter2D(img, -1, _SSIM_KERNEL_1D, _SSIM_KERNEL_1D)
+
+
+if numba is not None:
+    @numba.njit('f8(u1[:, ::1], u1[:, ::1])', parallel=True, fastmath=True,
+                cache=True)
+    def _mse_u8(a, b):
+        # Fused reduction: streams both images once with no temporary
+        # arrays; integer squares fit comfortably in the f8 accumulator
+        h, w = a.shape
+        acc = 0.0
+        for i in numba.prange(h):
+            row = 0
+            for j in range(w):
+                d = int(a[i, j]) - int(b[i, j])
+                row += d * d
+            acc += row
+        return acc / (h * w)
+else:
+    _mse_u8 = None
+
+
 def psnr(img1: np.ndarray, img2: np.ndarray) -> float:
-    """Calculate Peak Signal-to-Noise Ratio between two images"""
-    img1 = img1.astype(np.float64)
-    img2 = img2.astype(np.float64)
-    mse = np.mean((img1 - img2) ** 2)
+    """Calculate Peak Signal-to-Noise Ratio between two images
+
+    When Numba is installed and both inputs are contiguous uint8, the
+    MSE comes from a JIT-fused reduction that streams the data once
+    with no temporaries. Otherwise it works in float32: 8-bit image
+    data carries ~8 significant bits, so single precision loses nothing
+    meaningful while halving memory traffic; only the MSE sum is
+    accumulated in float64 to avoid precision loss over large slices.
+    """
+    if (_mse_u8 is not None
+            and img1.dtype == np.uint8 and img2.dtype == np.uint8
+            and img1.ndim == 2 and img2.ndim == 2
+            and img1.flags.c_contiguous and img2.flags.c_contiguous):
+        mse = _mse_u8(img1, img2)
+    else:
+        img1 = img1.astype(np.float32)
+        img2 = img2.astype(np.float32)
+        diff = img1 - img2
+        mse = float(np.square(diff).sum(dtype=np.float64)) / diff.size
     if mse == 0:
         return float('inf')
     PIXEL_MAX = 255.0
@@ -505,31 +838,76 @@ def psnr(img1: np.ndarray, img2: np.ndarray) -> float:
 
 
 def ssim(img1: np.ndarray, img2: np.ndarray) -> float:
-    """Calculate Structural Similarity Index between two images"""
-    img1 = img1.astype(np.float64)
-    img2 = img2.astype(np.float64)
+    """Calculate Structural Similarity Index between two images
 
-    C1 = (0.01 * 255) ** 2
-    C2 = (0.03 * 255) ** 2
+    Computed in float32 (see psnr); the five Gaussian passes are
+    bandwidth-bound, so halving the element size roughly halves their
+    runtime.
+    """
+    img1 = img1.astype(np.float32)
+    img2 = img2.astype(np.float32)
 
-    kernel_size = (11, 11)
-    sigma = 1.5
+    C1 = np.float32((0.01 * 255) ** 2)
+    C2 = np.float32((0.03 * 255) ** 2)
 
-    mu1 = cv2.GaussianBlur(img1, kernel_size, sigma)
-    mu2 = cv2.GaussianBlur(img2, kernel_size, sigma)
+    mu1 = _ssim_blur(img1)
+    mu2 = _ssim_blur(img2)
 
     mu1_sq = mu1 * mu1
     mu2_sq = mu2 * mu2
     mu1_mu2 = mu1 * mu2
 
-    sigma1_sq = cv2.GaussianBlur(img1 * img1, kernel_size, sigma) - mu1_sq
-    sigma2_sq = cv2.GaussianBlur(img2 * img2, kernel_size, sigma) - mu2_sq
-    sigma12 = cv2.GaussianBlur(img1 * img2, kernel_size, sigma) - mu1_mu2
+    sigma1_sq = _ssim_blur(img1 * img1) - mu1_sq
+    sigma2_sq = _ssim_blur(img2 * img2) - mu2_sq
+    sigma12 = _ssim_blur(img1 * img2) - mu1_mu2
 
     ssim_map = ((2 * mu1_mu2 + C1) * (2 * sigma12 + C2)) / \
                ((mu1_sq + mu2_sq + C1) * (sigma1_sq + sigma2_sq + C2))
 
-    return ssim_map.mean()
+    return float(ssim_map.mean())
+
+
+def psnr_ssim(img1: np.ndarray, img2: np.ndarray) -> Tuple[float, float]:
+    """
+    Compute PSNR and SSIM for a uint8 image pair in one fused pass.
+
+    The watermark QC step evaluates both metrics on the same pair;
+    calling the standalone functions casts the images to float64 twice
+    and re-derives everything independently. Here the MSE comes from an
+    integer diff (no float temporaries) and the SSIM statistics are
+    computed once in float32, which halves the bandwidth of the five
+    Gaussian passes that dominate this step.
+    """
+    diff = img1.astype(np.int16) - img2.astype(np.int16)
+    # Squares fit int32; the sum is accumulated in int64 so megapixel
+    # slices cannot overflow
+    mse = float(np.square(diff, dtype=np.int32).sum(dtype=np.int64)) / diff.size
+    if mse == 0:
+        psnr_val = float('inf')
+    else:
+        psnr_val = 20 * np.log10(255.0 / np.sqrt(mse))
+
+    a = img1.astype(np.float32)
+    b = img2.astype(np.float32)
+
+    C1 = np.float32((0.01 * 255) ** 2)
+    C2 = np.float32((0.03 * 255) ** 2)
+
+    mu1 = _ssim_blur(a)
+    mu2 = _ssim_blur(b)
+
+    mu1_sq = mu1 * mu1
+    mu2_sq = mu2 * mu2
+    mu1_mu2 = mu1 * mu2
+
+    sigma1_sq = _ssim_blur(a * a) - mu1_sq
+    sigma2_sq = _ssim_blur(b * b) - mu2_sq
+    sigma12 = _ssim_blur(a * b) - mu1_mu2
+
+    ssim_map = ((2 * mu1_mu2 + C1) * (2 * sigma12 + C2)) / \
+               ((mu1_sq + mu2_sq + C1) * (sigma1_sq + sigma2_sq + C2))
+
+    return float(psnr_val), float(ssim_map.mean())
 
 
 # ============================================================
@@ -537,13 +915,21 @@ def ssim(img1: np.ndarray, img2: np.ndarray) -> float:
 # ============================================================
 
 def normalize_slice_to_uint8(slice_data: np.ndarray):
-    """Normalize arbitrary float/int slice to uint8 [0,255]"""
-    slice = slice_data.astype(np.float64)
-    s_min, s_max = slice.min(), slice.max()
+    """Normalize arbitrary float/int slice to uint8 [0,255]
+
+    Works in float32 and folds the subtract/divide/scale into one
+    fused multiply-add pass (cv2.convertScaleAbs), instead of three
+    float64 temporaries plus separate round and cast passes. float32
+    resolves far finer than the 256 output levels, so the result is
+    unchanged.
+    """
+    slice = slice_data.astype(np.float32)
+    s_min = float(slice.min())
+    s_max = float(slice.max())
     if s_max - s_min == 0:
         return np.zeros_like(slice, dtype=np.uint8), s_min, s_max
-    norm = (slice - s_min) / (s_max - s_min)
-    scaled = (norm * 255.0).round().astype(np.uint8)
+    scale = 255.0 / (s_max - s_min)
+    scaled = cv2.convertScaleAbs(slice, alpha=scale, beta=-s_min * scale)
     return scaled, s_min, s_max
 
 
@@ -613,25 +999,52 @@ def embed_case_info_in_nifti(
     plaintext_bytes = combined_text.encode('utf-8')
     enc_case_bytes = aes_gcm_encrypt(plaintext_bytes, password)
 
-    wm_bits = bytes_to_bits(enc_case_bytes)
-    wm_bits = add_length_header_bits(wm_bits)
+    # Stay in uint8 bit arrays end to end; the old string pipeline
+    # round-tripped every bit through ASCII
+    wm_bits = bytes_to_bits_np(enc_case_bytes)
+    wm_bits = add_length_header_bits_np(wm_bits)
 
-    logger.log(f"Total watermark bits to embed: {len(wm_bits)}")
+    logger.log(f"Total watermark bits to embed: {wm_bits.size}")
 
     logger.log("Embedding watermark bits into slice (LSB)...")
     watermarked_slice_uint8 = embed_bits_in_image(slice_uint8, wm_bits)
 
-    slice_psnr = psnr(slice_uint8, watermarked_slice_uint8)
-    slice_ssim = ssim(slice_uint8, watermarked_slice_uint8)
+    slice_psnr, slice_ssim = psnr_ssim(slice_uint8, watermarked_slice_uint8)
     logger.log(f"PSNR (original vs watermarked): {slice_psnr:.2f} dB")
     logger.log(f"SSIM (original vs watermarked): {slice_ssim:.4f}")
 
     logger.log("Inserting watermarked slice back into volume...")
-    watermarked_slice_denorm = denormalize_slice_from_uint8(
-        watermarked_slice_uint8, s_min, s_max
-    )
-    watermarked_data = data.copy()
-    watermarked_data[:, :, mid_slice_idx] = watermarked_slice_denorm
+    n_bits = wm_bits.size
+    slice_pixels = slice_uint8.size
+    if n_bits * 16 <= slice_pixels:
+        # Sparse fast path: a few-KB watermark only touches the first
+        # n_bits pixels, and LSB embedding leaves roughly half of those
+        # unchanged. Shift just the changed pixels by whole uint8 steps
+        # in the original intensity scale — renormalization on
+        # extraction rounds each shifted value back to exactly the new
+        # uint8 level, so the recovered bits are identical to the
+        # full-slice denormalization path.
+        old_prefix = slice_uint8.ravel()[:n_bits]
+        new_prefix = watermarked_slice_uint8.ravel()[:n_bits]
+        changed_idx = np.nonzero(new_prefix != old_prefix)[0]
+        step = (s_max - s_min) / 255.0
+        delta = (new_prefix[changed_idx].astype(np.float64)
+                 - old_prefix[changed_idx]) * step
+        slice_view = data[:, :, mid_slice_idx]
+        slice_view.flat[changed_idx] = slice_view.flat[changed_idx] + delta
+        logger.log(
+            f"Sparse write-back: updated {changed_idx.size} of "
+            f"{slice_pixels} slice pixels"
+        )
+    else:
+        watermarked_slice_denorm = denormalize_slice_from_uint8(
+            watermarked_slice_uint8, s_min, s_max
+        )
+        # Write the slice straight into the loaded array: data is our
+        # own float copy from get_fdata() and is not read again
+        # afterwards
+        data[:, :, mid_slice_idx] = watermarked_slice_denorm
+    watermarked_data = data
 
     base, ext = os.path.splitext(nii_path)
     if ext == ".gz":
@@ -644,13 +1057,8 @@ def embed_case_info_in_nifti(
     nib.save(wm_img, wm_nii_path)
 
     logger.log("Encrypting forensically-marked evidence using AES-GCM...")
-    with open(wm_nii_path, "rb") as f:
-        wm_bytes = f.read()
-    enc_file_bytes = aes_gcm_encrypt(wm_bytes, password)
-
     enc_out_path = base + "_forensic_encrypted.bin"
-    with open(enc_out_path, "wb") as f:
-        f.write(enc_file_bytes)
+    aes_gcm_encrypt_stream(wm_nii_path, enc_out_path, password)
 
     logger.log(f"Encrypted evidence saved to: {enc_out_path}")
     logger.log("Evidence marking & encryption completed.\n")
@@ -660,7 +1068,7 @@ def embed_case_info_in_nifti(
         "evidence_id": evidence_metadata.evidence_id,
         "case_id": case_info.case_id,
         "mid_slice_idx": mid_slice_idx,
-        "wm_bits_len": len(wm_bits),
+        "wm_bits_len": wm_bits.size,
         "password_hash": derive_key_from_password(password).hex(),
         "original_hash": evidence_metadata.file_hash_sha256,
         "marked_hash": compute_file_hash(wm_nii_path),
@@ -672,9 +1080,67 @@ def embed_case_info_in_nifti(
 
     logger.log(f"Evidence metadata saved to: {metadata_path}")
 
-    return wm_nii_path, enc_out_path, mid_slice_idx, len(wm_bits), slice_psnr, slice_ssim
+    return wm_nii_path, enc_out_path, mid_slice_idx, wm_bits.size, slice_psnr, slice_ssim
+
+
+class _BufferLogger:
+    """Collects worker log lines for replay through the GUI logger."""
+    def __init__(self):
+        self.lines = []
+
+    def log(self, msg, level="INFO"):
+        self.lines.append((msg, level))
 
 
+def _embed_batch_worker_init():
+    # Parallelism comes from the worker processes; keep cv2 and BLAS at
+    # one thread each so a full pool does not oversubscribe the cores
+    os.environ["OPENBLAS_NUM_THREADS"] = "1"
+    cv2.setNumThreads(1)
+
+
+def _embed_batch_worker(job):
+    nii_path, case_info, evidence_metadata, password = job
+    worker_logger = _BufferLogger()
+    result = embed_case_info_in_nifti(
+        nii_path, case_info, evidence_metadata, password, worker_logger
+    )
+    return result, worker_logger.lines
+
+
+def embed_case_info_in_nifti_batch(
+    jobs: List[Tuple[str, CaseInformation, EvidenceMetadata, str]],
+    logger: Logger,
+    max_workers: Optional[int] = None
+) -> Dict[str, Tuple[str, str, int, int, float, float]]:
+    """
+    Mark and encrypt a batch of evidence files in parallel.
+
+    Each job is (nii_path, case_info, evidence_metadata, password).
+    Files are independent, so each runs embed_case_info_in_nifti in its
+    own worker process; the GUI Logger wraps a tkinter widget and
+    cannot cross processes, so workers buffer their log lines and the
+    batch replays them here as each file completes.
+
+    Returns a dict mapping nii_path to the usual result tuple. Failed
+    files are logged as errors and omitted from the result.
+    """
+    results = {}
+    with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count(),
+                             initializer=_embed_batch_worker_init) as pool:
+        futures = {pool.submit(_embed_batch_worker, job): job[0] for job in jobs}
+        for future in as_completed(futures):
+            nii_path = futures[future]
+            try:
+                result, lines = future.result()
+            except Exception as e:
+                logger.log(f"Batch marking failed for {nii_path}: {e}", "ERROR")
+                continue
+            for msg, level in lines:
+                logger.log(msg, level)
+            results[nii_path] = result
+    return results
+
 
 def decrypt_and_extract_from_evidence(
     enc_bin_path: str, 
@@ -706,24 +1172,27 @@ def decrypt_and_extract_from_evidence(
     logger.log(f"Temporary decrypted evidence at: {temp_path}")
     logger.log("Loading decrypted evidence...")
     wm_img = nib.load(temp_path)
-    wm_data = wm_img.get_fdata()
 
-    if wm_data.ndim < 3:
+    if len(wm_img.shape) < 3:
         raise ValueError("Decrypted evidence volume must be at least 3D.")
 
-    if mid_slice_idx >= wm_data.shape[2]:
+    if mid_slice_idx >= wm_img.shape[2]:
         raise ValueError("Slice index out of range for decrypted volume.")
 
     logger.log(f"Using slice index {mid_slice_idx} for extraction...")
-    wm_slice = wm_data[:, :, mid_slice_idx]
+    # Extraction only reads one slice, so slice through the dataobj
+    # proxy instead of materializing the full volume with get_fdata().
+    # For the gzipped temp file nibabel still decompresses sequentially
+    # up to the slice, but only slice-sized memory is ever allocated.
+    wm_slice = np.asanyarray(wm_img.dataobj[:, :, mid_slice_idx])
     wm_slice_uint8, s_min, s_max = normalize_slice_to_uint8(wm_slice)
 
     logger.log(f"Extracting {wm_bits_len} bits from watermarked evidence...")
-    extracted_bits_full = extract_bits_from_image(wm_slice_uint8, wm_bits_len)
+    extracted_bits_full = extract_bits_from_image_np(wm_slice_uint8, wm_bits_len)
 
     logger.log("Removing length header and reconstructing encrypted case data...")
-    data_bits = remove_length_header_bits(extracted_bits_full)
-    enc_case_bytes = bits_to_bytes(data_bits)
+    data_bits = remove_length_header_bits_np(extracted_bits_full)
+    enc_case_bytes = bits_to_bytes_np(data_bits)
 
     logger.log("Decrypting case information from watermark (AES-GCM)...")
     # This is the second integrity check. If this succeeds, the watermark is authentic.